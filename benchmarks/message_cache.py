@@ -0,0 +1,58 @@
+"""
+Per-turn prompt assembly cost as the history grows.
+
+Compares re-converting the dict history with ChatHandler.convert_to_chat_messages
+against reusing the LangChain messages cached in a ConversationSession.
+
+    python benchmarks/message_cache.py
+"""
+import timeit
+
+from argo.kernel.chat_handler import ChatHandler
+from argo.kernel.session import ConversationSession, SessionMessage
+
+HISTORY_SIZES = [10, 100, 1000, 10000]
+TURNS = 200
+SYSTEM_PROMPT = "You are a benchmark agent.\n" * 50
+TEXT = "The quick brown fox jumps over the lazy dog. " * 8
+
+
+def build_dict_history(size):
+    history = [{"role": "system", "content": SYSTEM_PROMPT}]
+    for i in range(size):
+        history.append({"role": "user" if i % 2 == 0 else "assistant", "content": TEXT})
+    return history
+
+
+def build_session(size):
+    session = ConversationSession("bench", "bench", size)
+    for i in range(size):
+        session.append(SessionMessage.from_role("user" if i % 2 == 0 else "assistant", TEXT, tokens=100))
+    return session
+
+
+def main():
+    system_message = SessionMessage.from_role("system", SYSTEM_PROMPT)
+    print(f"{'history':>8} {'convert (us/turn)':>20} {'cached (us/turn)':>18}")
+    for size in HISTORY_SIZES:
+        history = build_dict_history(size)
+        session = build_session(size)
+
+        # Both turns assemble the same prompt from a history of fixed size,
+        # nothing is appended, so every timed turn does the same work
+        def convert_turn():
+            messages = [ChatHandler.convert_to_chat_message(message) for message in history]
+            messages.append(SessionMessage.from_role("user", TEXT, tokens=100).message)
+
+        def cached_turn():
+            messages = [system_message.message]
+            messages.extend(session.chat_messages())
+            messages.append(SessionMessage.from_role("user", TEXT, tokens=100).message)
+
+        convert = timeit.timeit(convert_turn, number=TURNS) / TURNS * 1e6
+        cached = timeit.timeit(cached_turn, number=TURNS) / TURNS * 1e6
+        print(f"{size:>8} {convert:>20.1f} {cached:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
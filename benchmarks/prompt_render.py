@@ -0,0 +1,63 @@
+"""
+Render time of the message handler prompt for characters with large
+lore/knowledge arrays: str.format on every render versus the compiled
+CharacterPrompt that binds the static parts once.
+
+    python benchmarks/prompt_render.py
+"""
+import timeit
+
+from argo.character.schema import Character
+from argo.kernel.prompt import MessageTemplate, prompt_compiler
+
+SIZES = [10, 100, 1000, 5000]
+RENDERS = 500
+LINE = "A fairly long line of character lore that describes something notable."
+
+
+def build_character(size):
+    return Character(
+        name="bench",
+        bio=[LINE] * size,
+        lore=[LINE] * size,
+        knowledge=[LINE] * size,
+        postExamples=[],
+        topics=[],
+        style={"all": [LINE] * 10, "chat": [LINE] * 10},
+        adjectives=["fast"] * 10,
+    )
+
+
+def main():
+    print(f"{'lore':>6} {'str.format (us)':>16} {'compiled (us)':>14} {'compile once (ms)':>18}")
+    for size in SIZES:
+        character = build_character(size)
+        knowledge = "\n".join(character.knowledge[:5])
+
+        def format_render():
+            template = MessageTemplate.MESSAGE_HANDLER_TEMPLATE + MessageTemplate.COMPLETION_FOOTER
+            template.format(
+                agent_name=character.name,
+                action_examples="",
+                knowledge=knowledge,
+                bio="\n".join(character.bio),
+                lore="\n".join(character.lore),
+                attachments="",
+                message_directions="",
+                recent_messages="user: hello",
+                actions="",
+            )
+
+        compile_time = timeit.timeit(lambda: prompt_compiler.compile(character), number=1) * 1e3
+        prompt = prompt_compiler.compile(character)
+
+        def compiled_render():
+            prompt.render(knowledge=knowledge, recent_messages="user: hello")
+
+        formatted = timeit.timeit(format_render, number=RENDERS) / RENDERS * 1e6
+        compiled = timeit.timeit(compiled_render, number=RENDERS) / RENDERS * 1e6
+        print(f"{size:>6} {formatted:>16.1f} {compiled:>14.1f} {compile_time:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+End-to-end WebSocket load test against a running server.
+
+Start a worker backed by the mock provider, then point virtual users at it:
+
+    CHARACTERS_PATH=characters/mock.character.json uvicorn argo.main:app
+    python benchmarks/ws_load.py --users 200 --duration 60 --output results.json
+
+Results (TTFT, inter-chunk gap and per-kind latency percentiles, errors,
+throughput) are printed and optionally written as JSON for comparison
+across commits.
+"""
+import argparse
+import asyncio
+import json
+
+from argo.benchmark.load_test import LoadTestConfig, run_load_test
+
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(","):
+        kind, weight = part.split("=")
+        mix[kind.strip()] = float(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="ws://localhost:8000/ws")
+    parser.add_argument("--agent", default="mock")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--rate", type=float, default=0.0, help="requests/s across all users, 0 for back to back")
+    parser.add_argument("--mix", type=parse_mix, default="stream=0.8,chat=0.15,command=0.05")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    config = LoadTestConfig(
+        url=args.url,
+        agent_id=args.agent,
+        users=args.users,
+        duration=args.duration,
+        rate=args.rate,
+        mix=args.mix,
+        response_timeout=args.timeout,
+        seed=args.seed,
+    )
+    report = asyncio.run(run_load_test(config))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+import asyncio
+import json
+import math
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import websockets
+
+from argo.client.terminal.terminal_client import TerminalClient
+
+
+@dataclass
+class LoadTestConfig:
+    url: str = "ws://localhost:8000/ws"
+    agent_id: str = "mock"
+    users: int = 10
+    duration: float = 30.0
+    # Requests per second across all users; 0 sends back to back
+    rate: float = 0.0
+    # Weights of the request kinds each virtual user picks from
+    mix: Dict[str, float] = field(default_factory=lambda: {"stream": 0.8, "chat": 0.15, "command": 0.05})
+    commands: List[str] = field(default_factory=lambda: ["status", "agents"])
+    response_timeout: float = 60.0
+    seed: int = 0
+
+
+def percentile(ordered: List[float], q: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def summarize(samples: List[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered) if ordered else None,
+        "p50": percentile(ordered, 0.50),
+        "p95": percentile(ordered, 0.95),
+        "p99": percentile(ordered, 0.99),
+        "max": ordered[-1] if ordered else None,
+    }
+
+
+PRESENCE_NOTICE = re.compile(r"^User \S+ (dis)?connected$")
+
+
+def parse_frame(raw) -> Optional[dict]:
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def is_presence_notice(data: Optional[dict], raw) -> bool:
+    if data is None:
+        return isinstance(raw, str) and bool(PRESENCE_NOTICE.match(raw))
+    return data.get("type") == "system" and bool(PRESENCE_NOTICE.match(data.get("content", "")))
+
+
+class LoadTestStats:
+    def __init__(self):
+        self.ttft: List[float] = []
+        self.inter_chunk: List[float] = []
+        self.latency: Dict[str, List[float]] = {"stream": [], "chat": [], "command": []}
+        self.chunks = 0
+        self.errors: Dict[str, int] = {}
+        self.connect_failures = 0
+
+    def error(self, kind: str):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def report(self, elapsed: float) -> dict:
+        completed = sum(len(samples) for samples in self.latency.values())
+        return {
+            "elapsed": elapsed,
+            "completed": completed,
+            "throughput": completed / elapsed if elapsed else 0.0,
+            "chunks": self.chunks,
+            "connect_failures": self.connect_failures,
+            "errors": self.errors,
+            "ttft": summarize(self.ttft),
+            "inter_chunk": summarize(self.inter_chunk),
+            "latency": {kind: summarize(samples) for kind, samples in self.latency.items()},
+        }
+
+
+class VirtualUser(TerminalClient):
+    """
+    A TerminalClient driven by a script instead of the console: it sends a
+    weighted mix of commands, chats and streamed chats and times the replies.
+    """
+
+    def __init__(self, config: LoadTestConfig, uid: str, stats: LoadTestStats, rng: random.Random):
+        super().__init__(config.url, uid)
+        self.config = config
+        self.stats = stats
+        self.rng = rng
+        self.sent = 0
+        self.base_uid = uid
+        self.reconnects = 0
+
+    async def connect(self):
+        try:
+            self.ws = await websockets.connect(self.get_ws_url(), max_size=None)
+            # The server broadcasts "User X connected" to every socket,
+            # including this one, before sending the JSON welcome
+            while True:
+                raw = await asyncio.wait_for(self.ws.recv(), self.config.response_timeout)
+                data = parse_frame(raw)
+                if data and data.get("type") == "system" and data.get("content", "").startswith("Welcome"):
+                    return True
+        except Exception:
+            self.stats.connect_failures += 1
+            return False
+
+    async def reconnect(self) -> bool:
+        """
+        Replace the connection after a reply timed out, so its late frames
+        are not read as the reply to the next request. The server routes
+        frames by uid, hence the new connection gets a fresh one.
+        """
+        await self.cleanup()
+        self.reconnects += 1
+        self.uid = f"{self.base_uid}-{self.reconnects}"
+        return await self.connect()
+
+    async def receive(self, text: bool = False) -> tuple:
+        """
+        Next reply addressed to this user, as (json or None, raw text).
+        Connect and disconnect notices broadcast to every user are skipped,
+        as are plain-text frames unless ``text`` is set (command replies).
+        """
+        while True:
+            raw = await asyncio.wait_for(self.ws.recv(), self.config.response_timeout)
+            data = parse_frame(raw)
+            if is_presence_notice(data, raw):
+                continue
+            if data is None and not text:
+                continue
+            return data, raw
+
+    def next_kind(self) -> str:
+        kinds = list(self.config.mix)
+        return self.rng.choices(kinds, weights=[self.config.mix[kind] for kind in kinds])[0]
+
+    def chat_payload(self, stream: bool) -> str:
+        self.sent += 1
+        return json.dumps({
+            "type": "chat",
+            "content": f"{self.uid} message {self.sent}: what do you think about benchmarks?",
+            "agent_id": self.config.agent_id,
+            "stream": stream,
+        })
+
+    async def run_command(self):
+        command = self.rng.choice(self.config.commands)
+        start = time.monotonic()
+        await self.send_message(json.dumps({"type": "command", "content": command}))
+        await self.receive(text=True)
+        self.stats.latency["command"].append(time.monotonic() - start)
+
+    async def run_chat(self):
+        start = time.monotonic()
+        await self.send_message(self.chat_payload(False))
+        data, _ = await self.receive()
+        if not data or data.get("type") != "chat":
+            self.stats.error("chat_reply")
+            return
+        self.stats.latency["chat"].append(time.monotonic() - start)
+
+    async def run_stream(self):
+        start = time.monotonic()
+        await self.send_message(self.chat_payload(True))
+        last = None
+        failed = False
+        while True:
+            data, _ = await self.receive()
+            now = time.monotonic()
+            if not data or data.get("type") != "chat_stream":
+                is_error = data and data.get("type") == "system" and data.get("content", "").startswith("Error")
+                self.stats.error("stream_error" if is_error else "stream_reply")
+                return
+            if data.get("is_final"):
+                break
+            if data.get("content", "").startswith("Error:"):
+                # Servers that report failures in-band still end the stream
+                if not failed:
+                    self.stats.error("stream_error")
+                failed = True
+            if failed:
+                continue
+            if last is None:
+                self.stats.ttft.append(now - start)
+            else:
+                self.stats.inter_chunk.append(now - last)
+            last = now
+            self.stats.chunks += 1
+        if not failed:
+            self.stats.latency["stream"].append(time.monotonic() - start)
+
+    async def run(self, deadline: float):
+        if not await self.connect():
+            return
+        # Each user paces itself to its share of the target rate
+        interval = self.config.users / self.config.rate if self.config.rate > 0 else 0.0
+        next_send = time.monotonic() + self.rng.random() * interval
+        try:
+            while self.running and time.monotonic() < deadline:
+                delay = next_send - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_send = max(next_send + interval, time.monotonic())
+
+                kind = self.next_kind()
+                try:
+                    if kind == "command":
+                        await self.run_command()
+                    elif kind == "chat":
+                        await self.run_chat()
+                    else:
+                        await self.run_stream()
+                except asyncio.TimeoutError:
+                    self.stats.error("timeout")
+                    if not await self.reconnect():
+                        self.running = False
+                except websockets.ConnectionClosed:
+                    self.stats.error("connection_closed")
+                    self.running = False
+        finally:
+            await self.cleanup()
+
+
+async def run_load_test(config: LoadTestConfig) -> dict:
+    stats = LoadTestStats()
+    rng = random.Random(config.seed)
+    users = [
+        VirtualUser(config, f"load-{i}", stats, random.Random(rng.random()))
+        for i in range(config.users)
+    ]
+    start = time.monotonic()
+    await asyncio.gather(*(user.run(start + config.duration) for user in users))
+    report = stats.report(time.monotonic() - start)
+    report["config"] = {
+        "url": config.url,
+        "agent_id": config.agent_id,
+        "users": config.users,
+        "duration": config.duration,
+        "rate": config.rate,
+        "mix": config.mix,
+    }
+    return report
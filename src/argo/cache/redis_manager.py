@@ -5,6 +5,7 @@ from contextlib import asynccontextmanager
 
 from argo.configs import logger
 from argo.env_settings import settings
+from argo.metrics.tracing import tracer
 
 
 
@@ -67,17 +68,18 @@ class RedisManager:
             logger.info("Redis connection pool closed")
 
     @asynccontextmanager
-    async def get_connection(self):
+    async def get_connection(self, op: str = "call"):
         if self._pool is None:
             await self.init_pool()
-        try:
-            yield self._pool
-        except aioredis.RedisError as e:
-            logger.error(f"Redis operation error: {e}")
-            raise
+        with tracer.span(f"redis.{op}"):
+            try:
+                yield self._pool
+            except aioredis.RedisError as e:
+                logger.error(f"Redis operation error: {e}")
+                raise
     async def ping(self) -> bool:
 
-        async with self.get_connection() as redis:
+        async with self.get_connection("ping") as redis:
             try:
                 return await redis.ping()
             except Exception as e:
@@ -86,7 +88,7 @@ class RedisManager:
 
     async def hset(self, name: str, key: str, value: str) -> bool:
 
-        async with self.get_connection() as redis:
+        async with self.get_connection("hset") as redis:
             try:
                 return await redis.hset(name, key, value)
             except Exception as e:
@@ -95,7 +97,7 @@ class RedisManager:
 
     async def hget(self, name: str, key: str) -> Optional[str]:
 
-        async with self.get_connection() as redis:
+        async with self.get_connection("hget") as redis:
             try:
                 return await redis.hget(name, key)
             except Exception as e:
@@ -104,7 +106,7 @@ class RedisManager:
 
     async def hgetall(self, name: str) -> Dict[str, str]:
 
-        async with self.get_connection() as redis:
+        async with self.get_connection("hgetall") as redis:
             try:
                 return await redis.hgetall(name)
             except Exception as e:
@@ -113,7 +115,7 @@ class RedisManager:
 
     async def hdel(self, name: str, *keys: str) -> int:
 
-        async with self.get_connection() as redis:
+        async with self.get_connection("hdel") as redis:
             try:
                 return await redis.hdel(name, *keys)
             except Exception as e:
@@ -122,7 +124,7 @@ class RedisManager:
 
     async def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
 
-        async with self.get_connection() as redis:
+        async with self.get_connection("set") as redis:
             try:
                 return await redis.set(key, value, ex=ex)
             except Exception as e:
@@ -131,7 +133,7 @@ class RedisManager:
 
     async def get(self, key: str) -> Optional[str]:
 
-        async with self.get_connection() as redis:
+        async with self.get_connection("get") as redis:
             try:
                 return await redis.get(key)
             except Exception as e:
@@ -140,7 +142,7 @@ class RedisManager:
 
     async def delete(self, *keys: str) -> int:
 
-        async with self.get_connection() as redis:
+        async with self.get_connection("delete") as redis:
             try:
                 return await redis.delete(*keys)
             except Exception as e:
@@ -149,7 +151,7 @@ class RedisManager:
 
     async def exists(self, *keys: str) -> int:
 
-        async with self.get_connection() as redis:
+        async with self.get_connection("exists") as redis:
             try:
                 return await redis.exists(*keys)
             except Exception as e:
@@ -158,7 +160,7 @@ class RedisManager:
 
     async def expire(self, key: str, seconds: int) -> bool:
 
-        async with self.get_connection() as redis:
+        async with self.get_connection("expire") as redis:
             try:
                 return await redis.expire(key, seconds)
             except Exception as e:
@@ -167,7 +169,7 @@ class RedisManager:
 
     async def ttl(self, key: str) -> int:
 
-        async with self.get_connection() as redis:
+        async with self.get_connection("ttl") as redis:
             try:
                 return await redis.ttl(key)
             except Exception as e:
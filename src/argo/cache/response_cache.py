@@ -0,0 +1,128 @@
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Iterator, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage
+
+from argo.configs import logger
+from argo.env_settings import settings
+
+WHITESPACE = re.compile(r"\s+")
+TRAILING_PUNCTUATION = re.compile(r"[\s.!?,;:~]+$")
+
+
+def _digest(model: str, temperature, parts: Sequence[str]) -> str:
+    h = hashlib.sha256(f"{model}\x1f{temperature}".encode("utf-8"))
+    for part in parts:
+        h.update(b"\x1e")
+        h.update(part.encode("utf-8"))
+    return h.hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    return TRAILING_PUNCTUATION.sub("", WHITESPACE.sub(" ", text.strip().lower()))
+
+
+def cache_keys(model: str, temperature, messages: Sequence[BaseMessage]) -> Tuple[str, str]:
+    """
+    Exact and normalized cache keys of a request. The normalized key ignores
+    case, repeated whitespace and trailing punctuation, so "Hello!" and
+    "hello" share a cached answer.
+    """
+    exact = _digest(model, temperature, [f"{m.type}:{m.content}" for m in messages])
+    normalized = _digest(model, temperature, [f"{m.type}:{normalize_text(m.content)}" for m in messages])
+    return exact, normalized
+
+
+def replay_chunks(text: str, size: int = 32) -> Iterator[str]:
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+class ResponseCache:
+    """
+    Two-tier LLM response cache: an in-process LRU in front of Redis.
+
+    Lookups try the exact key before the normalized key. A Redis hit is
+    promoted into the local tier.
+    """
+
+    KEY_PREFIX = "llm_cache:"
+
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[int] = None):
+        self.max_size = max_size if max_size is not None else settings.LLM_CACHE_MAX_SIZE
+        self.ttl = ttl if ttl is not None else settings.LLM_CACHE_TTL
+        self._local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._redis_manager = None
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def bind_redis(self, redis_manager):
+        self._redis_manager = redis_manager
+
+    def _get_local(self, key: str) -> Optional[str]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires, text = entry
+        if expires < time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return text
+
+    def _set_local(self, key: str, text: str):
+        self._local[key] = (time.monotonic() + self.ttl, text)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+    async def get(self, keys: Sequence[str]) -> Optional[str]:
+        for key in keys:
+            text = self._get_local(key)
+            if text is not None:
+                self.local_hits += 1
+                return text
+
+        if self._redis_manager is not None:
+            for key in keys:
+                try:
+                    text = await self._redis_manager.get(self.KEY_PREFIX + key)
+                except Exception as e:
+                    logger.warning(f"LLM cache lookup failed: {e}")
+                    break
+                if text is not None:
+                    self.redis_hits += 1
+                    for k in keys:
+                        self._set_local(k, text)
+                    return text
+
+        self.misses += 1
+        return None
+
+    async def set(self, keys: Sequence[str], text: str):
+        for key in keys:
+            self._set_local(key, text)
+        if self._redis_manager is not None:
+            try:
+                for key in keys:
+                    await self._redis_manager.set(self.KEY_PREFIX + key, text, ex=self.ttl)
+            except Exception as e:
+                logger.warning(f"LLM cache store failed: {e}")
+
+    def stats(self) -> dict:
+        hits = self.local_hits + self.redis_hits
+        total = hits + self.misses
+        return {
+            "size": len(self._local),
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
+
+
+response_cache = ResponseCache()
@@ -1,71 +1,131 @@
 import asyncio
-import json
-from typing import Dict, Optional, Tuple
-from jsonschema import validate
-from importlib import resources
+import os
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
 
 from pydantic import ValidationError
 
+from argo.character.example_index import example_index_cache
+from argo.character.knowledge_index import KnowledgeIndex
 from argo.character.schema import Character
+from argo.character.validation import CharacterValidationError, character_loader
 from argo.configs import logger
 from argo.kernel.character_agent import CharacterAgent
+from argo.kernel.session import SessionStore
 
 
 class CharacterManager:
-    def __init__(self):
+    def __init__(self, session_store: Optional[SessionStore] = None):
         self._lock = asyncio.Lock()
         self.characters: Dict[str, Character] = {}
         self.agents: Dict[str, CharacterAgent] = {}
+        self.session_store = session_store or SessionStore()
+        # Absolute file path -> (character name, content digest) of loaded files
+        self.sources: Dict[str, Tuple[str, str]] = {}
+        self._reload_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
 
-        with resources.open_text("argo.character", "character.schema.json") as schema_file:
-            self.schema = json.load(schema_file)
-
-        # with open('character.schema.json', 'r') as schema_file:
-        #     self.schema = json.load(schema_file)
-
-    def check_character(self, character_file):
-        with open(character_file, 'r') as json_file:
-            json_data = json.load(json_file)
+    async def read_character(self, character_file) -> Tuple[Optional[dict], str, str]:
+        """Returns the file data and content digest, or None and the reason it failed."""
         try:
-            #TODO:CHECK,the schema file needs to be improved to meet the production needs
-            # validate(instance=json_data, schema=self.schema)
-
-            logger.info('JSON file is valid against the schema.')
-            return json_data
-        except:
-            logger.error(f'JSON file is not valid against the schema')
-            return None
+            data, digest = await character_loader.load(character_file)
+            return data, digest, ""
+        except (OSError, CharacterValidationError) as e:
+            return None, "", str(e)
 
     async def load_character(self, filepath: str) -> Tuple[bool, Optional[Character],str]:
+        # File reading, parsing and validation run in a worker pool, and the
+        # lock is only held to update the registry, so many characters can
+        # load concurrently
+        character, digest, error = await self.parse_character(filepath)
+        if character is None:
+            return False, None, error
 
         async with self._lock:
-            json_data = self.check_character(filepath)
-            if  json_data is None:
-                error = f"Invalid character configuration in {filepath}"
-                logger.error(error)
-                return False,None,error
-
-            try:
-                character = Character(**json_data)
-            except ValidationError as e:
-                error = f"Invalid character configuration{e}"
-                logger.error(error)
-                return False,None,error
-
             if character.name in self.characters:
                 error = f"Character with name '{character.name}' already exists"
                 logger.error(error)
                 return False, None, error
-
+            # Reserve the name while the agent is built
             self.characters[character.name] = character
-            logger.info(f"Successfully loaded and cached character: {character.name}")
+
+        try:
             await self.init_character_agent(character)
+        except Exception:
+            async with self._lock:
+                self.characters.pop(character.name, None)
+            raise
+        self.sources[os.path.abspath(filepath)] = (character.name, digest)
+        logger.info(f"Successfully loaded and cached character: {character.name}")
+
+        return True,character,"success"
+
+    async def parse_character(self, filepath: str) -> Tuple[Optional[Character], str, str]:
+        json_data, digest, reason = await self.read_character(filepath)
+        if  json_data is None:
+            error = f"Invalid character configuration in {filepath}: {reason}"
+            logger.error(error)
+            return None, "", error
+
+        try:
+            return Character(**json_data), digest, ""
+        except ValidationError as e:
+            error = f"Invalid character configuration{e}"
+            logger.error(error)
+            return None, "", error
+
+    def find_source(self, target: str, allowed: Iterable[str]) -> Optional[str]:
+        """
+        Resolve ``target`` to a character file: either one of the ``allowed``
+        paths or the name of a loaded character. Returns None for anything
+        else.
+        """
+        path = os.path.abspath(target)
+        if path in {os.path.abspath(allowed_path) for allowed_path in allowed}:
+            return path
+        return next((source for source, (name, _) in self.sources.items() if name == target), None)
+
+    async def reload_character(self, filepath: str) -> Tuple[bool, Optional[Character], str]:
+        """
+        Load a new or changed character file and swap it in.
+
+        The new agent is fully built before the registry references are
+        replaced, so requests already holding the old agent finish on it
+        while new requests get the new version.
+        """
+        path = os.path.abspath(filepath)
+        async with self._reload_locks[path]:
+            character, digest, error = await self.parse_character(path)
+            if character is None:
+                return False, None, error
+            previous = self.sources.get(path)
+            if previous and previous[1] == digest:
+                return True, self.characters.get(previous[0]), "unchanged"
+
+            owner = next((source for source, (name, _) in self.sources.items() if name == character.name), None)
+            if owner is not None and owner != path:
+                error = f"Character with name '{character.name}' already exists in {owner}"
+                logger.error(error)
+                return False, None, error
+
+            agent = await self.build_character_agent(character)
+            async with self._lock:
+                if previous and previous[0] != character.name:
+                    self.characters.pop(previous[0], None)
+                    self.agents.pop(previous[0], None)
+                self.characters[character.name] = character
+                self.agents[character.name] = agent
+                self.sources[path] = (character.name, digest)
+
+            logger.info(f"Reloaded character {character.name} from {path}")
+            return True, character, "reloaded" if previous else "loaded"
 
-            return True,character,"success"
+    async def build_character_agent(self, character: Character) -> CharacterAgent:
+        knowledge_index = await KnowledgeIndex.build(character)
+        example_index = await asyncio.to_thread(example_index_cache.get, character)
+        return CharacterAgent(character, self.session_store, knowledge_index, example_index)
 
     async def init_character_agent(self,character:Character):
-        agent = CharacterAgent(character)
-        self.agents[character.name] = agent
+        self.agents[character.name] = await self.build_character_agent(character)
 
     async def get_agent(self, name: str) -> CharacterAgent:
 
@@ -86,6 +146,9 @@ class CharacterManager:
             if name not in self.characters:
                 raise KeyError(f"Character '{name}' not found")
             del self.characters[name]
+            self.agents.pop(name, None)
+            for source in [source for source, (owner, _) in self.sources.items() if owner == name]:
+                del self.sources[source]
             logger.info(f"Character '{name}' removed from cache")
 
     async def list_characters(self) -> list[str]:
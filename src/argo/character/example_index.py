@@ -0,0 +1,90 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import List, Optional
+
+from argo.character.schema import Character, MessageExample
+from argo.configs import logger
+from argo.retrieval.bm25 import BM25Index, tokenize
+from argo.retrieval.dense import DenseIndex, HashingVectorizer, numpy_available
+
+
+class ExampleIndex:
+    """
+    Similarity index over Character.message_examples, used to pick the few
+    example dialogues closest to the current user message.
+
+    Examples are matched on their non-agent turns. With numpy the examples
+    are hashed TF-IDF vectors searched by one matrix-vector product,
+    otherwise BM25 is used.
+    """
+
+    def __init__(self, character: Character):
+        self.examples = [self.format_example(example) for example in character.message_examples]
+        queries = [
+            " ".join(message.content.text for message in example if message.user != character.name)
+            for example in character.message_examples
+        ]
+
+        self.vectorizer = None
+        self.dense = None
+        self.bm25 = None
+        if numpy_available():
+            self.vectorizer = HashingVectorizer()
+            self.dense = DenseIndex(self.vectorizer.fit_transform([tokenize(query) for query in queries]))
+        else:
+            self.bm25 = BM25Index(queries)
+
+    def __len__(self) -> int:
+        return len(self.examples)
+
+    @staticmethod
+    def format_example(example: List[MessageExample]) -> str:
+        return "\n".join(f"{message.user}: {message.content.text}" for message in example)
+
+    def search(self, query: str, k: int) -> List[str]:
+        if k <= 0 or not self.examples:
+            return []
+        if self.dense is not None:
+            hits = self.dense.search(self.vectorizer.transform(tokenize(query)), k)
+        else:
+            hits = self.bm25.search(query, k)
+        return [self.examples[example_id] for example_id, _ in hits]
+
+
+class ExampleIndexCache:
+    """
+    Example indexes keyed by a hash of the character's examples, so an index
+    is built once and rebuilt only when the examples change.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._indexes: "OrderedDict[str, ExampleIndex]" = OrderedDict()
+
+    @staticmethod
+    def content_hash(character: Character) -> str:
+        payload = json.dumps(
+            [character.name, [[message.model_dump() for message in example] for example in character.message_examples]],
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, character: Character) -> Optional[ExampleIndex]:
+        if not character.message_examples:
+            return None
+
+        key = self.content_hash(character)
+        index = self._indexes.get(key)
+        if index is None:
+            index = ExampleIndex(character)
+            self._indexes[key] = index
+            while len(self._indexes) > self.max_size:
+                self._indexes.popitem(last=False)
+            logger.info(f"Built example index for {character.name}: {len(index)} examples")
+        else:
+            self._indexes.move_to_end(key)
+        return index
+
+
+example_index_cache = ExampleIndexCache()
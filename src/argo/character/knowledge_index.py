@@ -0,0 +1,95 @@
+import asyncio
+from typing import List, Optional
+
+from argo.character.schema import Character, KnowledgeItem
+from argo.configs import logger
+from argo.retrieval.bm25 import BM25Index
+from argo.retrieval.dense import DenseIndex, numpy_available
+
+
+class KnowledgeIndex:
+    """
+    Retrieval index over Character.knowledge.
+
+    BM25 is always available. When the character configures an embedding
+    model and numpy is installed, items are also embedded once at build time
+    and dense results are fused with BM25 by reciprocal rank.
+    """
+    RRF_K = 60
+
+    def __init__(self, items: List[str], embeddings=None, vectors=None):
+        self.items = items
+        self.bm25 = BM25Index(items)
+        self.embeddings = embeddings
+        self.dense = DenseIndex(vectors) if vectors is not None else None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @staticmethod
+    def knowledge_texts(character: Character) -> List[str]:
+        texts = []
+        for item in character.knowledge:
+            if isinstance(item, str):
+                texts.append(item)
+            elif isinstance(item, KnowledgeItem):
+                texts.append(item.content)
+            elif isinstance(item, dict) and item.get("content"):
+                texts.append(item["content"])
+        return [text for text in texts if text.strip()]
+
+    @classmethod
+    async def build(cls, character: Character) -> Optional["KnowledgeIndex"]:
+        texts = cls.knowledge_texts(character)
+        if not texts:
+            return None
+
+        knowledge_settings = character.settings.knowledge if character.settings else None
+        embeddings, vectors = None, None
+        if knowledge_settings and knowledge_settings.embedding_model:
+            if not numpy_available():
+                logger.warning(f"numpy not installed, {character.name} knowledge uses BM25 only")
+            else:
+                try:
+                    embeddings = cls.create_embeddings(character)
+                    vectors = await embeddings.aembed_documents(texts)
+                except Exception as e:
+                    logger.error(f"Failed to embed knowledge of {character.name}, using BM25 only: {e}")
+                    embeddings, vectors = None, None
+
+        index = await asyncio.to_thread(cls, texts, embeddings, vectors)
+        logger.info(f"Built knowledge index for {character.name}: {len(index)} items")
+        return index
+
+    @staticmethod
+    def create_embeddings(character: Character):
+        from langchain_openai import OpenAIEmbeddings
+
+        llm_settings = character.settings.llm
+        kwargs = {}
+        if llm_settings and llm_settings.api_key:
+            kwargs["api_key"] = llm_settings.api_key
+        if llm_settings and llm_settings.base_url:
+            kwargs["base_url"] = llm_settings.base_url
+        return OpenAIEmbeddings(model=character.settings.knowledge.embedding_model, **kwargs)
+
+    async def search(self, query: str, k: int) -> List[str]:
+        if k <= 0:
+            return []
+
+        hits = self.bm25.search(query, k)
+        if self.dense is None:
+            return [self.items[doc_id] for doc_id, _ in hits]
+
+        try:
+            dense_hits = self.dense.search(await self.embeddings.aembed_query(query), k)
+        except Exception as e:
+            logger.error(f"Dense knowledge search failed, using BM25 only: {e}")
+            return [self.items[doc_id] for doc_id, _ in hits]
+
+        fused = {}
+        for ranking in (hits, dense_hits):
+            for rank, (doc_id, _) in enumerate(ranking):
+                fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (self.RRF_K + rank)
+        ranked = sorted(fused, key=fused.get, reverse=True)[:k]
+        return [self.items[doc_id] for doc_id in ranked]
@@ -1,5 +1,5 @@
 from typing import List, Optional, Union
-from pydantic import BaseModel, Field, RootModel
+from pydantic import BaseModel, Field, RootModel, model_validator
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 
@@ -26,6 +26,12 @@ class TTSSettings(BaseModel):
     url: str=""
     description: str=""
 
+class LLMRouteSettings(BaseModel):
+    model: str
+    model_provider: Optional[str] = None
+    api_key: str=""
+    base_url: str=""
+
 class LLMSettings(BaseModel):
     model: str
     api_key: str=""
@@ -37,8 +43,42 @@ class LLMSettings(BaseModel):
     context_round:int=Field(default=2,ge=0,le=10)
     max_resp_length:int = Field(default=500, ge=300, le=4000)
     max_tokens:int = Field(default=1000, ge=1000)
+    context_window:int = Field(default=8192, ge=2000)
     timeout:int = Field(default=10)
-    max_retries:int = Field(default=3)
+    # Retries of rate-limited or failed calls, done by the scheduler lane
+    max_retries:int = Field(default=3, ge=0)
+    fallbacks: List[LLMRouteSettings] = Field(default_factory=list)
+    hedge: bool = True
+    hedge_quantile: float = Field(default=0.95, gt=0, le=1)
+    hedge_min_delay: float = Field(default=1.0, ge=0)
+    # Hedge deadline before a route has latency samples, defaults to hedge_min_delay
+    hedge_initial_delay: Optional[float] = Field(default=None, ge=0)
+    first_token_timeout: float = Field(default=30.0, gt=0)
+
+
+class CompactionSettings(BaseModel):
+    enabled: bool = False
+    threshold: int = Field(default=20, ge=2)
+    keep_last: int = Field(default=6, ge=0)
+    max_messages: int = Field(default=60, ge=4)
+
+    @model_validator(mode="after")
+    def check_limits(self):
+        # Otherwise a session never grows past threshold, or nothing is folded
+        if self.max_messages <= self.threshold:
+            raise ValueError(f"compaction max_messages ({self.max_messages}) must be greater than threshold ({self.threshold})")
+        if self.keep_last >= self.threshold:
+            raise ValueError(f"compaction keep_last ({self.keep_last}) must be less than threshold ({self.threshold})")
+        return self
+
+
+class KnowledgeSettings(BaseModel):
+    top_k: int = Field(default=5, ge=0)
+    embedding_model: Optional[str] = None
+
+
+class ExampleSettings(BaseModel):
+    top_k: int = Field(default=3, ge=0)
 
 
 class Settings(BaseModel):
@@ -46,6 +86,9 @@ class Settings(BaseModel):
     llm: LLMSettings=None
     voice: VoiceSettings=None
     tts:TTSSettings=None
+    compaction: CompactionSettings=None
+    knowledge: KnowledgeSettings=None
+    examples: ExampleSettings=None
 
     class Config:
         extra = "allow"
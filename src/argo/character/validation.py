@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from importlib import resources
+from typing import Callable, Optional, Tuple
+
+from argo.configs import logger
+from argo.env_settings import settings
+
+
+class CharacterValidationError(ValueError):
+    pass
+
+
+@lru_cache(maxsize=None)
+def schema_bytes() -> bytes:
+    return resources.files("argo.character").joinpath("character.schema.json").read_bytes()
+
+
+@lru_cache(maxsize=None)
+def compiled_validator() -> Callable[[dict], None]:
+    """
+    Validation function for character.schema.json, built once per process.
+
+    fastjsonschema generates Python code for the schema and is used when
+    installed; otherwise jsonschema's validator is built once and reused.
+    """
+    schema = json.loads(schema_bytes())
+    try:
+        import fastjsonschema
+    except ImportError:
+        fastjsonschema = None
+
+    if fastjsonschema is not None:
+        validate = fastjsonschema.compile(schema)
+
+        def check(instance: dict):
+            try:
+                validate(instance)
+            except fastjsonschema.JsonSchemaException as e:
+                raise CharacterValidationError(e.message)
+        return check
+
+    import jsonschema
+
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    validator = validator_class(schema)
+
+    def check(instance: dict):
+        error = jsonschema.exceptions.best_match(validator.iter_errors(instance))
+        if error is not None:
+            path = "/".join(str(part) for part in error.absolute_path)
+            raise CharacterValidationError(f"{path or '<root>'}: {error.message}")
+    return check
+
+
+# Content hashes validated by this process
+_validated = set()
+
+
+def load_character_file(filepath: str, cache_dir: Optional[str] = None) -> Tuple[dict, str]:
+    """
+    Read, parse and validate a character file. Returns the data and the
+    hash of the schema and file content, which changes with the file.
+
+    Validation results are cached by that hash, in memory and, with
+    ``cache_dir``, as marker files that survive restarts, so unchanged
+    characters are only parsed.
+    """
+    with open(filepath, "rb") as f:
+        content = f.read()
+    try:
+        data = json.loads(content)
+    except ValueError as e:
+        raise CharacterValidationError(f"{filepath} is not valid JSON: {e}")
+
+    digest = hashlib.sha256(schema_bytes() + b"\0" + content).hexdigest()
+    if digest in _validated:
+        return data, digest
+    marker = os.path.join(cache_dir, digest) if cache_dir else None
+    if marker and os.path.exists(marker):
+        _validated.add(digest)
+        return data, digest
+
+    compiled_validator()(data)
+    _validated.add(digest)
+    if marker:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            open(marker, "w").close()
+        except OSError as e:
+            logger.warning(f"Could not record validation of {filepath}: {e}")
+    return data, digest
+
+
+class CharacterFileLoader:
+    """
+    Loads character files off the event loop: in the default thread pool,
+    or in a process pool of ``workers`` processes so that validating
+    thousands of files is not serialized on the GIL.
+    """
+
+    def __init__(self, workers: int = 0, cache_dir: Optional[str] = None):
+        self.workers = workers
+        self.cache_dir = cache_dir
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.workers > 0 and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def load(self, filepath: str) -> Tuple[dict, str]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), load_character_file, filepath, self.cache_dir)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+character_loader = CharacterFileLoader(
+    settings.CHARACTER_VALIDATION_WORKERS,
+    settings.CHARACTER_VALIDATION_CACHE_DIR or None
+)
@@ -0,0 +1,65 @@
+import asyncio
+import os
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from argo.configs import logger
+
+FileState = Tuple[int, int]
+
+
+class CharacterWatcher:
+    """
+    Polls character files and calls ``on_change`` with the path of every
+    file whose modification time or size changed.
+
+    Polling needs no extra dependency and works the same on every platform
+    and on mounted volumes where inotify events are not delivered.
+    """
+
+    def __init__(self, paths: Iterable[str], on_change: Callable[[str], Awaitable], interval: float = 2.0):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.on_change = on_change
+        self.interval = interval
+        self._state: Dict[str, Optional[FileState]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _scan(self) -> Dict[str, Optional[FileState]]:
+        state = {}
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                state[path] = None
+        return state
+
+    async def start(self):
+        self._state = await asyncio.to_thread(self._scan)
+        self._task = asyncio.create_task(self._watch())
+        logger.info(f"Watching {len(self.paths)} character files every {self.interval}s")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                state = await asyncio.to_thread(self._scan)
+            except Exception as e:
+                logger.error(f"Error scanning character files: {e}")
+                continue
+            changed = [path for path, current in state.items()
+                       if current is not None and current != self._state.get(path)]
+            self._state = state
+            for path in changed:
+                try:
+                    await self.on_change(path)
+                except Exception as e:
+                    logger.error(f"Error reloading character {path}: {e}")
@@ -1,4 +1,101 @@
-from fastapi import APIRouter, Depends
+import asyncio
+import json
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException
+from starlette.responses import StreamingResponse
+
+from argo.client.rest.schema import ChatRequest, BatchChatRequest, BatchChatItem
+from argo.command.commands import CommandContext
+from argo.configs import logger
+from argo.env_settings import settings
+from argo.kernel.character_agent import CharacterAgent
+from argo.kernel.llm_scheduler import Priority
+from argo.kernel.runtime_state import runtime
+from argo.kernel.schema import GenericResponse
 
 router = APIRouter(prefix="/agent", tags=["Agent"])
 
+# Shared by every batch request of this worker, so concurrent bulk jobs
+# cannot starve interactive traffic of LLM slots
+batch_semaphore = asyncio.Semaphore(settings.AGENT_BATCH_CONCURRENCY)
+
+
+async def get_agent(agent_id: str) -> CharacterAgent:
+    try:
+        return await runtime.character_manager.get_agent(agent_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
+
+
+def sse_event(data: dict, event: str = None) -> str:
+    payload = json.dumps(data, ensure_ascii=False)
+    if event:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return f"data: {payload}\n\n"
+
+
+@router.post("/{agent_id}/chat", summary="chat with an agent")
+async def chat(agent_id: str, form: ChatRequest, agent: CharacterAgent = Depends(get_agent)):
+    context = CommandContext(form.uid, None, runtime)
+    response = await agent.chat(form.message, context)
+    return GenericResponse.success({"agent_id": agent_id, "content": response})
+
+
+@router.post("/{agent_id}/chat/stream", summary="chat with an agent, streamed as server-sent events")
+async def chat_stream(agent_id: str, form: ChatRequest, agent: CharacterAgent = Depends(get_agent)):
+    context = CommandContext(form.uid, None, runtime)
+
+    async def events() -> AsyncIterator[str]:
+        chunks = agent.achat(form.message, context)
+        try:
+            async for chunk in chunks:
+                yield sse_event({"content": chunk})
+        except Exception as e:
+            # A failed reply ends with an error event instead of done
+            yield sse_event({"agent_id": agent_id, "error": str(e)}, event="error")
+            return
+        finally:
+            await chunks.aclose()
+        yield sse_event({"agent_id": agent_id}, event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def run_batch_item(index: int, item: BatchChatItem) -> dict:
+    result = {"index": index, "id": item.id, "agent_id": item.agent_id}
+    async with batch_semaphore:
+        try:
+            agent = await runtime.character_manager.get_agent(item.agent_id)
+        except KeyError:
+            result["error"] = f"Agent {item.agent_id} not found"
+            return result
+        try:
+            context = CommandContext(item.uid, None, runtime)
+            result["content"] = await agent.chat(item.message, context, Priority.BACKGROUND)
+        except Exception as e:
+            logger.error(f"Batch item {index} for {item.agent_id} failed: {e}")
+            result["error"] = str(e)
+    return result
+
+
+@router.post("/batch", summary="run many chats concurrently, results streamed as NDJSON in completion order")
+async def chat_batch(form: BatchChatRequest):
+    if len(form.items) > settings.AGENT_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.AGENT_BATCH_MAX_ITEMS} items per batch")
+
+    async def lines() -> AsyncIterator[str]:
+        tasks = [asyncio.create_task(run_batch_item(i, item)) for i, item in enumerate(form.items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield json.dumps(await next_done, ensure_ascii=False) + "\n"
+        finally:
+            # Client went away: drop the items that have not finished
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -0,0 +1,19 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ChatRequest(BaseModel):
+    uid: str
+    message: str
+
+
+class BatchChatItem(BaseModel):
+    id: Optional[str] = None
+    agent_id: str
+    uid: str
+    message: str
+
+
+class BatchChatRequest(BaseModel):
+    items: List[BatchChatItem] = Field(min_length=1)
@@ -2,6 +2,10 @@ from typing import Dict, List
 
 from argo.command.commands import CommandHandler, CommandContext
 from argo.configs import logger
+from argo.metrics.registry import metrics
+from argo.metrics.tracing import tracer
+
+COMMANDS = metrics.counter("argo_commands_total", "Command executions", ["command", "status"])
 
 
 class CommandManager:
@@ -17,14 +21,18 @@ class CommandManager:
 
     async def execute(self, command: str, args: List[str], context: CommandContext):
 
-        handler = self._commands.get(command.lower())
-        if handler:
-            try:
-                await handler.execute(args, context)
-            except Exception as e:
-                await context.ws.send_text(f"Error executing command {command}: {str(e)}")
-        else:
-            await context.ws.send_text(f"Unknown command: {command}")
+        with tracer.span("command", command=command.lower()):
+            handler = self._commands.get(command.lower())
+            if handler:
+                try:
+                    await handler.execute(args, context)
+                    COMMANDS.inc(command.lower(), "ok")
+                except Exception as e:
+                    COMMANDS.inc(command.lower(), "error")
+                    await context.ws.send_text(f"Error executing command {command}: {str(e)}")
+            else:
+                COMMANDS.inc("unknown", "unknown")
+                await context.ws.send_text(f"Unknown command: {command}")
 
     def get_help(self) -> str:
         help_text = "Available command:\n"
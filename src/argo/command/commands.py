@@ -71,6 +71,52 @@ class LoadCharacterCommandHandler(CommandHandler):
             await context.ws.send_text(f"Load {character.name} character successfully")
 
 
+class ReloadCharacterCommandHandler(CommandHandler):
+    def __init__(self, command_manager):
+        super().__init__("Reload a character on every worker: /reload name|filepath")
+        self._manager = command_manager
+
+    async def execute(self, args: List[str], context: CommandContext):
+        if not args:
+            await context.ws.send_text("Usage: /reload name|filepath")
+            return
+
+        filepath = context.runtime_state.reloadable_source(args[0])
+        if filepath is None:
+            await context.ws.send_text(f"Unknown character: {args[0]}")
+            return
+
+        success, character, message = await context.runtime_state.reload_character(filepath)
+        if not success:
+            await context.ws.send_text(message)
+        elif message == "unchanged":
+            await context.ws.send_text(f"{character.name} is unchanged")
+        else:
+            await context.ws.send_text(f"Reload {character.name} character successfully")
+
+
+class ClearConversationCommandHandler(CommandHandler):
+    def __init__(self, command_manager):
+        super().__init__("Clear your conversation with an agent: /clear agent_id")
+        self._manager = command_manager
+
+    async def execute(self, args: List[str], context: CommandContext):
+        if not args:
+            await context.ws.send_text("Usage: /clear agent_id")
+            return
+
+        agent_id = args[0]
+        try:
+            agent = await context.runtime_state.character_manager.get_agent(agent_id)
+        except KeyError:
+            await context.ws.send_text(f"Agent {agent_id} not found")
+            return
+        if await agent.clear_conversation(context.uid, agent_id):
+            await context.ws.send_text(f"Conversation with {agent_id} cleared")
+        else:
+            await context.ws.send_text(f"No conversation with {agent_id}")
+
+
 class MessageCommandHandler(CommandHandler):
     def __init__(self, ws_manager: WebSocketManager):
         super().__init__("Send private message to user: /msg user_id message")
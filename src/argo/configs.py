@@ -1,29 +1,77 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 import os
 import sys
 
+from decouple import config
+
+from argo.metrics.registry import metrics
+
 os.environ['USER_AGENT'] = 'argo'
 
 USING_FILE_HANDLER = False
+LOG_LEVEL = config("LOG_LEVEL", default="INFO", cast=str).upper()
+# One JSON object per line instead of the text format
+LOG_JSON = config("LOG_JSON", default=False, cast=bool)
+# Write records from a background thread so slow stdout/disk never blocks the event loop
+LOG_ASYNC = config("LOG_ASYNC", default=True, cast=bool)
+LOG_QUEUE_SIZE = config("LOG_QUEUE_SIZE", default=10000, cast=int)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "file": record.filename,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+LOG_DROPPED = metrics.counter(
+    "argo_log_records_dropped_total", "Log records dropped because the log writer fell behind", ["level"]
+)
+
+
+class DropQueueHandler(QueueHandler):
+    """
+    QueueHandler that drops records instead of blocking when the writer
+    thread falls behind, and counts them in argo_log_records_dropped_total.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_DROPPED.inc(record.levelname)
 
-def init_logger():
-    try:
-        import langchain
-        langchain.verbose = False
-    except:
-        pass
 
+def init_logger():
     # log format
     LOG_FORMAT = "%(asctime)s - %(filename)s[line:%(lineno)d] - %(levelname)s: %(message)s"
     logger = logging.getLogger('argo')
-    logger.setLevel(logging.INFO)
+    logger.setLevel(LOG_LEVEL)
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
 
     logging.getLogger("websockets").setLevel(logging.WARNING)
 
     logging.getLogger("asyncio").setLevel(logging.WARNING)
-    handlers = None
+    handlers = [logging.StreamHandler()]
     if USING_FILE_HANDLER:
         # log dir
         LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
@@ -42,11 +90,22 @@ def init_logger():
         )
         handlers = [file_handler]
 
+    formatter = JsonFormatter() if LOG_JSON else logging.Formatter(LOG_FORMAT, datefmt="%Y-%m-%d %H:%M:%S")
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    if LOG_ASYNC:
+        queue_handler = DropQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        # Only merge args in the caller, the writer thread applies the real format
+        queue_handler.setFormatter(logging.Formatter("%(message)s"))
+        listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        handlers = [queue_handler]
+
     logging.basicConfig(
-        level=logging.INFO,
+        level=LOG_LEVEL,
         handlers=handlers,
-        format=LOG_FORMAT,
-        datefmt="%Y-%m-%d %H:%M:%S"
     )
     logging.getLogger("requests").setLevel(logging.WARNING)
     logging.getLogger("urllib3").setLevel(logging.WARNING)
@@ -54,7 +113,58 @@ def init_logger():
 
     return logger
 
+
+class SampledLogger:
+    """
+    Rate-limited logging for high-frequency call sites.
+
+    Each key may log ``burst`` records at once and ``per_second`` records
+    per second after that; the rest are counted and the count is appended
+    to the next record that gets through. Messages use lazy %-style
+    arguments, so suppressed records cost neither formatting nor I/O.
+    """
+
+    def __init__(self, logger: logging.Logger, per_second: float = 1.0, burst: int = 10):
+        self.logger = logger
+        self.per_second = per_second
+        self.burst = float(burst)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def log(self, level: int, key: str, msg: str, *args):
+        self._log(level, key, msg, args)
+
+    def _log(self, level: int, key: str, msg: str, args: tuple):
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, suppressed = self._buckets.get(key, (self.burst, now, 0))
+            tokens = min(self.burst, tokens + (now - updated) * self.per_second)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now, suppressed + 1)
+                return
+            self._buckets[key] = (tokens - 1, now, 0)
+        if suppressed:
+            msg = msg + " (%d similar messages suppressed)"
+            args = args + (suppressed,)
+        # Attribute the record to the caller of info()/warning()/...
+        self.logger.log(level, msg, *args, stacklevel=3)
+
+    def debug(self, key: str, msg: str, *args):
+        self._log(logging.DEBUG, key, msg, args)
+
+    def info(self, key: str, msg: str, *args):
+        self._log(logging.INFO, key, msg, args)
+
+    def warning(self, key: str, msg: str, *args):
+        self._log(logging.WARNING, key, msg, args)
+
+    def error(self, key: str, msg: str, *args):
+        self._log(logging.ERROR, key, msg, args)
+
 logger = init_logger()
+sampled_logger = SampledLogger(logger)
 
 WS_MAX_SIZE = 1 * 1024 * 1024
 LOCAL_SERVER_BASE_URL = "http://127.0.0.1:8081"
@@ -78,14 +188,10 @@ COMMON_PROMPT_TEMPLATES = {
 
 WORKING_DIR = os.path.dirname(__file__)
 IMAGE_DIR = os.path.join(WORKING_DIR, "images")
-if not os.path.exists(IMAGE_DIR):
-    os.mkdir(IMAGE_DIR)
 
 COMPOSITE_MODULES = {'tool', 'custom_tool'}
 
 UPLOAD_DIR = os.path.join(WORKING_DIR, "upload")
-if not os.path.exists(UPLOAD_DIR):
-    os.mkdir(UPLOAD_DIR)
 
 HUGGING_FACE_TOKEN = None
 
@@ -12,6 +12,8 @@ class EnvSettings(BaseModel):
     API_DEBUG: bool = config("API_DEBUG", default=False, cast=bool)
     WS_HOST: str = config("WS_HOST", default="127.0.0.1", cast=str)
     WS_PORT: int = config("WS_PORT", default=8001, cast=int)
+    WS_STREAM_FLUSH_INTERVAL_MS: int = config("WS_STREAM_FLUSH_INTERVAL_MS", default=20, cast=int)
+    WS_STREAM_FLUSH_BYTES: int = config("WS_STREAM_FLUSH_BYTES", default=64, cast=int)
     UPLOAD_DIR: str = config("UPLOAD_DIR", default="uploads", cast=str)
 
 
@@ -66,6 +68,43 @@ class EnvSettings(BaseModel):
     )
 
 
+    SESSION_MAX_COUNT: int = config("SESSION_MAX_COUNT", default=10000, cast=int)
+    SESSION_IDLE_TTL: int = config("SESSION_IDLE_TTL", default=1800, cast=int)
+    SESSION_BACKEND: str = config("SESSION_BACKEND", default="memory", cast=str)
+    SESSION_REDIS_TTL: int = config("SESSION_REDIS_TTL", default=86400, cast=int)
+
+    LLM_CACHE_ENABLED: bool = config("LLM_CACHE_ENABLED", default=False, cast=bool)
+    LLM_CACHE_MAX_SIZE: int = config("LLM_CACHE_MAX_SIZE", default=10000, cast=int)
+    LLM_CACHE_TTL: int = config("LLM_CACHE_TTL", default=3600, cast=int)
+    LLM_POOL_MAX_CONNECTIONS: int = config("LLM_POOL_MAX_CONNECTIONS", default=200, cast=int)
+    LLM_POOL_MAX_KEEPALIVE: int = config("LLM_POOL_MAX_KEEPALIVE", default=50, cast=int)
+    LLM_POOL_KEEPALIVE_EXPIRY: float = config("LLM_POOL_KEEPALIVE_EXPIRY", default=30.0, cast=float)
+    LLM_HTTP2: bool = config("LLM_HTTP2", default=True, cast=bool)
+    LLM_MAX_CONCURRENCY: int = config("LLM_MAX_CONCURRENCY", default=32, cast=int)
+    LLM_REQUESTS_PER_MINUTE: int = config("LLM_REQUESTS_PER_MINUTE", default=0, cast=int)
+    LLM_TOKENS_PER_MINUTE: int = config("LLM_TOKENS_PER_MINUTE", default=0, cast=int)
+    LLM_RATE_LIMIT_BACKOFF: float = config("LLM_RATE_LIMIT_BACKOFF", default=2.0, cast=float)
+    LLM_SINGLE_FLIGHT_ENABLED: bool = config("LLM_SINGLE_FLIGHT_ENABLED", default=True, cast=bool)
+    MOCK_LLM_TTFT: float = config("MOCK_LLM_TTFT", default=0.2, cast=float)
+    MOCK_LLM_TOKENS_PER_SECOND: float = config("MOCK_LLM_TOKENS_PER_SECOND", default=50.0, cast=float)
+    MOCK_LLM_ERROR_RATE: float = config("MOCK_LLM_ERROR_RATE", default=0.0, cast=float)
+    MOCK_LLM_ERROR_STATUS: int = config("MOCK_LLM_ERROR_STATUS", default=400, cast=int)
+    MOCK_LLM_MEAN_TOKENS: int = config("MOCK_LLM_MEAN_TOKENS", default=100, cast=int)
+    MOCK_LLM_TOKENS_STDDEV: float = config("MOCK_LLM_TOKENS_STDDEV", default=30.0, cast=float)
+    MOCK_LLM_SEED: int = config("MOCK_LLM_SEED", default=0, cast=int)
+    METRICS_PUBLISH_INTERVAL: int = config("METRICS_PUBLISH_INTERVAL", default=5, cast=int)
+    TRACE_SAMPLE_RATE: float = config("TRACE_SAMPLE_RATE", default=0.0, cast=float)
+    TRACE_BUFFER_SIZE: int = config("TRACE_BUFFER_SIZE", default=500, cast=int)
+    STARTUP_PHASE_TIMEOUT: float = config("STARTUP_PHASE_TIMEOUT", default=30.0, cast=float)
+    STARTUP_CHARACTERS_TIMEOUT: float = config("STARTUP_CHARACTERS_TIMEOUT", default=300.0, cast=float)
+    STARTUP_CHARACTER_CONCURRENCY: int = config("STARTUP_CHARACTER_CONCURRENCY", default=16, cast=int)
+    CHARACTER_VALIDATION_WORKERS: int = config("CHARACTER_VALIDATION_WORKERS", default=0, cast=int)
+    CHARACTER_VALIDATION_CACHE_DIR: str = config("CHARACTER_VALIDATION_CACHE_DIR", default=".cache/characters", cast=str)
+    CHARACTER_HOT_RELOAD: bool = config("CHARACTER_HOT_RELOAD", default=False, cast=bool)
+    CHARACTER_WATCH_INTERVAL: float = config("CHARACTER_WATCH_INTERVAL", default=2.0, cast=float)
+    AGENT_BATCH_CONCURRENCY: int = config("AGENT_BATCH_CONCURRENCY", default=8, cast=int)
+    AGENT_BATCH_MAX_ITEMS: int = config("AGENT_BATCH_MAX_ITEMS", default=500, cast=int)
+
     ENVIRONMENT: str = config("ENVIRONMENT",default="development",cast=str)
 
 
@@ -1,28 +1,74 @@
-from typing import Dict, Union, AsyncGenerator, Optional, List
+from typing import Dict, Union, AsyncGenerator, Optional, List, Tuple, TYPE_CHECKING
 import json
-from argo.character.schema import Character
+
+from langchain_core.messages import BaseMessage
+
+from argo.character.schema import Character, LLMSettings, KnowledgeSettings, ExampleSettings
 from argo.command.commands import CommandContext
-from argo.configs import logger
+from argo.configs import logger, sampled_logger
 from argo.kernel.chat_handler import ChatHandler
+from argo.kernel.compaction import ConversationCompactor
+from argo.kernel.llm_scheduler import Priority
+from argo.kernel.prompt import prompt_compiler
+from argo.kernel.session import SessionStore, ConversationSession, SessionMessage
+from argo.metrics.chat_metrics import chat_metrics
+from argo.metrics.tracing import tracer
+from argo.kernel.tokens import fit_history, prompt_budget
 from argo.kernel.schema import GenericResponse
 
+if TYPE_CHECKING:
+    from argo.character.example_index import ExampleIndex
+    from argo.character.knowledge_index import KnowledgeIndex
+
 
 class CharacterAgent:
     def __init__(
             self,
-            character:Character
+            character:Character,
+            session_store: Optional[SessionStore] = None,
+            knowledge_index: Optional["KnowledgeIndex"] = None,
+            example_index: Optional["ExampleIndex"] = None
     ):
         self.character = character
         self.name = character.name
         self.model_provider = character.model_provider.lower()
         self.plugins = character.plugins
+        self.llm_settings = character.settings.llm if character.settings else None
 
         # Initialize chat handler
         self.chat_handler = self.init_chat_handler()
 
-        # Build system message
-        self.system_message = self._build_system_message()
-        self.conversation_history: List[Dict] = []
+        # Build system message, static prompt parts are cached per character content
+        self.prompt = prompt_compiler.compile(character)
+        self.system_message = self.prompt.system_message
+        # Built once per character and shared by every session of this agent
+        self.system_chat_message = SessionMessage.from_role("system", self.system_message) \
+            if self.system_message else None
+
+        # Per (uid, agent) conversation sessions, shared between agents of a manager
+        self.session_store = session_store or SessionStore()
+        context_round = self.llm_settings.context_round if self.llm_settings else 2
+        # One round is a user message plus the assistant reply
+        self.max_history_messages = context_round * 2
+
+        knowledge_settings = character.settings.knowledge if character.settings else None
+        self.knowledge_index = knowledge_index
+        self.knowledge_top_k = knowledge_settings.top_k if knowledge_settings else KnowledgeSettings().top_k
+
+        example_settings = character.settings.examples if character.settings else None
+        self.example_index = example_index
+        self.example_top_k = example_settings.top_k if example_settings else ExampleSettings().top_k
+
+        compaction = character.settings.compaction if character.settings else None
+        self.compactor = None
+        if compaction and compaction.enabled:
+            self.compactor = ConversationCompactor(self.chat_handler, compaction, self.session_store)
+            # Keep turns around until they have been folded into the summary
+            self.max_history_messages = max(self.max_history_messages, compaction.max_messages)
+        self.prompt_budget = prompt_budget(
+            self.llm_settings.context_window if self.llm_settings else LLMSettings.model_fields["context_window"].default,
+            self.llm_settings.max_tokens if self.llm_settings else None
+        )
 
 
     def init_chat_handler(self):
@@ -43,109 +89,174 @@ class CharacterAgent:
             kwargs["max_tokens"] = max_tokens
         if timeout:
             kwargs["timeout"] = timeout
-        if max_retries:
+        if max_retries is not None:
             kwargs["max_retries"] = max_retries
         if temperature:
             kwargs["temperature"] = temperature
 
+        fallbacks = llm_settings.fallbacks if llm_settings else []
+        routing = {
+            "hedge": llm_settings.hedge,
+            "hedge_quantile": llm_settings.hedge_quantile,
+            "hedge_min_delay": llm_settings.hedge_min_delay,
+            "hedge_initial_delay": llm_settings.hedge_initial_delay,
+            "first_token_timeout": llm_settings.first_token_timeout,
+        } if llm_settings else None
 
-
-        logger.info(f"init chat handler: {self.model_provider} base_url: {base_url}")
+        logger.info(f"init chat handler: {self.model_provider} base_url: {base_url} fallbacks: {len(fallbacks)}")
         return ChatHandler(
             model_provider=self.model_provider,
             model_name=llm_settings.model,
             api_key=api_key,
+            fallbacks=fallbacks,
+            routing=routing,
             **kwargs
         )
 
-    def _build_system_message(self) -> str:
-        system_message_parts = [
-            f"You are {self.character.name}.",
-            "\nBiography:",
-            *self.character.bio,
-            "\nLore:",
-            *self.character.lore,
-            "\nStyle guidelines:",
-            *self.character.style.all,
-            "\nChat specific style:",
-            *self.character.style.chat,
-        ]
-
-        if self.character.adjectives:
-            system_message_parts.extend([
-                "\nKey characteristics:",
-                *[f"- {adj}" for adj in self.character.adjectives]
-            ])
-
-        return "\n".join(system_message_parts)
+    async def get_session(self, uid: str) -> ConversationSession:
+        return await self.session_store.get_session(uid, self.name, self.max_history_messages)
+
+    def build_chat_messages(
+            self,
+            session: ConversationSession,
+            user_message: SessionMessage,
+            context_messages: Optional[List[SessionMessage]] = None
+    ) -> Tuple[List[BaseMessage], int]:
+        """
+        Assemble system message, per-turn context, history and the current
+        user message within the prompt budget. History is trimmed oldest
+        first, everything else is always kept.
+
+        Returns the messages and their total from the cached token counts.
+        """
+        fixed = []
+        if self.system_chat_message:
+            fixed.append(self.system_chat_message)
+        if context_messages:
+            fixed.extend(context_messages)
+        if session.summary:
+            fixed.append(session.summary)
+        reserved = sum(message.tokens for message in fixed) + user_message.tokens
+
+        messages = [message.message for message in fixed]
+        if session.total_tokens + reserved <= self.prompt_budget:
+            messages.extend(session.chat_messages())
+            tokens = reserved + session.total_tokens
+        else:
+            history = fit_history(session.messages, self.prompt_budget, reserved)
+            logger.debug(f"Trimmed history of {session.key} to {len(history)}/{len(session)} messages")
+            messages.extend(message.message for message in history)
+            tokens = reserved + sum(message.tokens for message in history)
+        messages.append(user_message.message)
+        return messages, tokens
+
+    async def retrieve_knowledge(self, message: str) -> Optional[SessionMessage]:
+        if not self.knowledge_index or self.knowledge_top_k <= 0:
+            return None
+        items = await self.knowledge_index.search(message, self.knowledge_top_k)
+        if not items:
+            return None
+        return SessionMessage.from_role("system", "# Knowledge\n" + "\n".join(f"- {item}" for item in items))
+
+    def select_examples(self, message: str) -> Optional[SessionMessage]:
+        if not self.example_index or self.example_top_k <= 0:
+            return None
+        examples = self.example_index.search(message, self.example_top_k)
+        if not examples:
+            return None
+        return SessionMessage.from_role("system", "# Example conversations\n" + "\n\n".join(examples))
+
+    async def build_context_messages(self, message: str) -> List[SessionMessage]:
+        context_messages = []
+        knowledge = await self.retrieve_knowledge(message)
+        if knowledge:
+            context_messages.append(knowledge)
+        examples = self.select_examples(message)
+        if examples:
+            context_messages.append(examples)
+        return context_messages
+
+    async def record_turn(self, session: ConversationSession, user_message: SessionMessage, response: str) -> SessionMessage:
+        reply = SessionMessage.from_role("assistant", response)
+        await self.session_store.append(session, user_message, reply)
+        if self.compactor:
+            self.compactor.maybe_compact(session)
+        return reply
 
     async def chat(
             self,
             message: str,
-            context: CommandContext
+            context: CommandContext,
+            priority: Priority = Priority.INTERACTIVE
     ):
-        if not self.conversation_history and self.system_message:
-            self.conversation_history.append({
-                "role": "system",
-                "content": self.system_message
-            })
-
-        self.conversation_history.append({
-            "role": "user",
-            "content": message
-        })
-
-        chat_messages = self.chat_handler.convert_to_chat_messages(self.conversation_history)
-
-        response = await self.chat_handler.chat_model.invoke(chat_messages)
-        logger.debug(response)
-        full_response = response.content
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": full_response
-        })
-        return full_response
+        with tracer.span("agent.chat", agent=self.name):
+            timer = chat_metrics.timer(self.name, self.chat_handler.model_name)
+            completion_tokens, error = 0, None
+            try:
+                session = await self.get_session(context.uid)
+                user_message = SessionMessage.from_role("user", message)
+                chat_messages, timer.prompt_tokens = self.build_chat_messages(
+                    session, user_message, await self.build_context_messages(message)
+                )
+
+                full_response = await self.chat_handler.ainvoke(chat_messages, priority, timer.prompt_tokens)
+                timer.token()
+                reply = await self.record_turn(session, user_message, full_response)
+                completion_tokens = reply.tokens
+                return full_response
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                timer.finish(completion_tokens, error)
 
     async def achat(
             self,
             message: str,
             context: CommandContext
     ) -> AsyncGenerator[str, None]:
-
+        """
+        Stream the reply to ``message``. Provider failures are raised to the
+        caller after the chunks received so far.
+        """
+        span = tracer.start("agent.achat", agent=self.name)
+        timer = chat_metrics.timer(self.name, self.chat_handler.model_name)
+        completion_tokens, error = 0, None
         try:
-            if not self.conversation_history and self.system_message:
-                self.conversation_history.append({
-                    "role": "system",
-                    "content": self.system_message
-                })
-
-            self.conversation_history.append({
-                "role": "user",
-                "content": message
-            })
-
-            chat_messages = self.chat_handler.convert_to_chat_messages(self.conversation_history)
-
-            logger.info(f"chat_messages: {chat_messages}")
-            full_response = ""
-
-            async for chunk in self.chat_handler.chat_model.astream(chat_messages):
-                chunk_text = chunk.content
-                full_response += chunk_text
-                logger.info(f"chunk: {chunk}")
+            session = await self.get_session(context.uid)
+            user_message = SessionMessage.from_role("user", message)
+            chat_messages, timer.prompt_tokens = self.build_chat_messages(
+                session, user_message, await self.build_context_messages(message)
+            )
+
+            logger.debug("chat_messages: %s", chat_messages)
+            chunks = []
+
+            async for chunk_text in self.chat_handler.astream(chat_messages, tokens=timer.prompt_tokens):
+                timer.token()
+                chunks.append(chunk_text)
                 yield chunk_text
 
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": full_response
-            })
+            full_response = "".join(chunks)
+            logger.debug("streamed %d chunks, %d chars to %s", len(chunks), len(full_response), context.uid)
 
-        except Exception as e:
-            logger.error(f"Model API error: {str(e)}")
-            yield f"Error: {str(e)}"
+            reply = await self.record_turn(session, user_message, full_response)
+            completion_tokens = reply.tokens
 
-    def clear_conversation(self,uid,agent_id):
-        pass
+        except Exception as e:
+            error = e
+            sampled_logger.error("agent.achat", "Model API error: %s", e)
+            raise
+        except BaseException as e:
+            # Cancelled, or the consumer closed the stream early
+            error = e
+            raise
+        finally:
+            timer.finish(completion_tokens, error)
+            span.finish(error)
+
+    async def clear_conversation(self, uid: str, agent_id: Optional[str] = None) -> bool:
+        return await self.session_store.remove(uid, agent_id or self.name)
 
 
 
@@ -1,11 +1,17 @@
 from typing import Optional, List, Dict, Union, AsyncGenerator
 
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage, AIMessage
 
+from argo.character.schema import LLMRouteSettings, LLMSettings
+from argo.cache.response_cache import response_cache, cache_keys, replay_chunks
 from argo.configs import logger
-from argo.utils.llm import get_chat_model
+from argo.env_settings import settings
+from argo.kernel.llm_router import ChatRoute, HedgedRouter
+from argo.kernel.llm_scheduler import llm_scheduler, Priority
+from argo.kernel.single_flight import single_flight
+from argo.utils.llm_clients import llm_clients
+from argo.utils.mock_llm import MockChatModel
 
 
 class ChatHandler:
@@ -15,43 +21,149 @@ class ChatHandler:
             model_provider: str,
             model_name: Optional[str] = None,
             api_key: Optional[str] = None,
+            fallbacks: Optional[List[LLMRouteSettings]] = None,
+            routing: Optional[Dict] = None,
             **kwargs
     ):
         self.model_provider = model_provider.lower()
         self.model_name = model_name
         self.api_key = api_key
+        # Retried by the scheduler lane, the SDK clients themselves don't retry
+        self.retries = kwargs.pop("max_retries", LLMSettings.model_fields["max_retries"].default)
         self.kwargs = kwargs
         logger.info(f"init character: {self.model_provider}")
         self.chat_model = self.get_chat_model()
-        self.conversation_history: List[Dict] = []
-
-    def get_chat_model(self) -> BaseChatModel:
-        if self.model_provider == "openai":
-            return ChatOpenAI(
-                model_name=self.model_name or "gpt-3.5-turbo",
-                openai_api_key=self.api_key,
-                **self.kwargs
+        self.response_cache = response_cache if settings.LLM_CACHE_ENABLED else None
+        self.single_flight = single_flight if settings.LLM_SINGLE_FLIGHT_ENABLED else None
+        self.lane = llm_scheduler.lane(self.kwargs.get("base_url"), self.model_name)
+
+        routes = [ChatRoute(self.model_name or self.model_provider, self.chat_model, self.lane, self.retries)]
+        for fallback in fallbacks or []:
+            routes.append(self.create_route(fallback))
+        self.router = HedgedRouter(routes, **(routing or {}))
+
+    def create_route(self, route_settings: LLMRouteSettings) -> ChatRoute:
+        kwargs = dict(self.kwargs)
+        kwargs.pop("base_url", None)
+        if route_settings.base_url:
+            kwargs["base_url"] = route_settings.base_url
+        chat_model = self.get_chat_model(
+            model_provider=route_settings.model_provider or self.model_provider,
+            model_name=route_settings.model,
+            api_key=route_settings.api_key or self.api_key,
+            **kwargs
+        )
+        lane = llm_scheduler.lane(kwargs.get("base_url"), route_settings.model)
+        return ChatRoute(route_settings.model, chat_model, lane, self.retries)
+
+    def get_chat_model(
+            self,
+            model_provider: Optional[str] = None,
+            model_name: Optional[str] = None,
+            api_key: Optional[str] = None,
+            **kwargs
+    ) -> BaseChatModel:
+        model_provider = (model_provider or self.model_provider).lower()
+        model_name = model_name or self.model_name
+        api_key = api_key or self.api_key
+        kwargs = kwargs or self.kwargs
+
+        if model_provider == "openai":
+            return llm_clients.chat_openai(
+                model=model_name or "gpt-3.5-turbo",
+                api_key=api_key,
+                max_retries=0,
+                **kwargs
             )
-        elif self.model_provider == "anthropic":
-            return ChatOpenAI(
-                model_name=self.model_name or "claude-3-5-sonnet-20240620",
-                openai_api_key=self.api_key,
-                **self.kwargs
+        elif model_provider == "anthropic":
+            return llm_clients.chat_openai(
+                model=model_name or "claude-3-5-sonnet-20240620",
+                api_key=api_key,
+                max_retries=0,
+                **kwargs
             )
+        elif model_provider == "mock":
+            return MockChatModel.from_settings(model_name, max_tokens=kwargs.get("max_tokens"))
 
         else:
-            raise ValueError(f"Unsupported model provider: {self.model_provider}")
+            raise ValueError(f"Unsupported model provider: {model_provider}")
+
+    def cache_keys(self, messages: List[BaseMessage]):
+        return cache_keys(self.model_name or self.model_provider, self.kwargs.get("temperature"), messages)
+
+    async def ainvoke(
+            self,
+            messages: List[BaseMessage],
+            priority: Priority = Priority.INTERACTIVE,
+            tokens: int = 0
+    ) -> str:
+        keys = self.cache_keys(messages)
+        if self.response_cache:
+            cached = await self.response_cache.get(keys)
+            if cached is not None:
+                return cached
+
+        if self.single_flight:
+            return await self.single_flight.do(keys[0], lambda: self._ainvoke(messages, keys, priority, tokens))
+        return await self._ainvoke(messages, keys, priority, tokens)
+
+    async def _ainvoke(self, messages: List[BaseMessage], keys, priority: Priority, tokens: int) -> str:
+        response = await self.router.ainvoke(messages, priority, tokens)
+        logger.debug(response)
+        if self.response_cache:
+            await self.response_cache.set(keys, response)
+        return response
+
+    async def astream(
+            self,
+            messages: List[BaseMessage],
+            priority: Priority = Priority.INTERACTIVE,
+            tokens: int = 0
+    ) -> AsyncGenerator[str, None]:
+        keys = self.cache_keys(messages)
+        if self.response_cache:
+            cached = await self.response_cache.get(keys)
+            if cached is not None:
+                for chunk in replay_chunks(cached):
+                    yield chunk
+                return
+
+        if self.single_flight:
+            source = self.single_flight.stream(keys[0], lambda: self._astream(messages, keys, priority, tokens))
+        else:
+            source = self._astream(messages, keys, priority, tokens)
+        async for chunk in source:
+            yield chunk
+
+    async def _astream(
+            self,
+            messages: List[BaseMessage],
+            keys,
+            priority: Priority,
+            tokens: int
+    ) -> AsyncGenerator[str, None]:
+        full_response = ""
+        async for chunk in self.router.astream(messages, priority, tokens):
+            full_response += chunk
+            yield chunk
+
+        if self.response_cache:
+            await self.response_cache.set(keys, full_response)
+
+    @staticmethod
+    def convert_to_chat_message(message: Dict[str, str]) -> Optional[BaseMessage]:
+        if message["role"] == "system":
+            return SystemMessage(content=message["content"])
+        elif message["role"] == "user":
+            return HumanMessage(content=message["content"])
+        elif message["role"] == "assistant":
+            return AIMessage(content=message["content"])
+        return None
 
     def convert_to_chat_messages(self, messages: List[Dict[str, str]]):
         chat_messages = []
         for message in messages:
-            if message["role"] == "system":
-                chat_messages.append(SystemMessage(content=message["content"]))
-            elif message["role"] == "user":
-                chat_messages.append(HumanMessage(content=message["content"]))
-            elif message["role"] == "assistant":
-                chat_messages.append(AIMessage(content=message["content"]))
+            chat_message = self.convert_to_chat_message(message)
+            if chat_message is not None:
+                chat_messages.append(chat_message)
         return chat_messages
-
-
-
@@ -0,0 +1,69 @@
+import asyncio
+from typing import Optional, Set, TYPE_CHECKING
+
+from langchain_core.documents import Document
+
+from argo.character.schema import CompactionSettings
+from argo.configs import logger
+from argo.kernel.llm_scheduler import Priority
+from argo.kernel.session import ConversationSession, SessionStore
+from argo.utils.llm import summarize
+
+if TYPE_CHECKING:
+    from argo.kernel.chat_handler import ChatHandler
+
+
+class ConversationCompactor:
+    """
+    Folds older turns of a session into a rolling summary in the background.
+
+    Once a session holds more than ``threshold`` messages, everything but the
+    last ``keep_last`` messages is summarized together with the previous
+    summary. The summarization runs as a separate task, so the request that
+    triggered it is never blocked.
+    """
+
+    def __init__(self, chat_handler: "ChatHandler", compaction: CompactionSettings, session_store: SessionStore):
+        self.chat_handler = chat_handler
+        self.session_store = session_store
+        self.threshold = compaction.threshold
+        self.keep_last = compaction.keep_last
+        self._tasks: Set[asyncio.Task] = set()
+
+    def maybe_compact(self, session: ConversationSession) -> Optional[asyncio.Task]:
+        if session.compacting or len(session) <= self.threshold:
+            return None
+
+        folded = session.history()[:len(session) - self.keep_last]
+        if not folded:
+            return None
+
+        session.compacting = True
+        task = asyncio.create_task(self._compact(session, folded))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _compact(self, session: ConversationSession, folded):
+        try:
+            docs = []
+            if session.summary:
+                docs.append(Document(page_content=session.summary.content))
+            docs.extend(
+                Document(page_content=f"{message.role}: {message.content}")
+                for message in folded
+            )
+
+            # Summaries queue behind interactive chat on the provider lane
+            tokens = sum(message.tokens for message in folded)
+            if session.summary:
+                tokens += session.summary.tokens
+            async with self.chat_handler.lane.slot(Priority.BACKGROUND, tokens):
+                summary = await summarize(docs, chat_model=self.chat_handler.chat_model)
+            await self.session_store.apply_summary(session, summary, folded)
+            logger.info(f"Compacted {len(folded)} messages of session {session.key}")
+        except Exception as e:
+            logger.error(f"Failed to compact session {session.key}: {e}")
+        finally:
+            session.compacting = False
+
@@ -5,6 +5,11 @@ from redis import RedisError
 
 from argo.configs import logger
 from argo.kernel.schema import EventMessage
+from argo.metrics.registry import metrics
+from argo.metrics.tracing import tracer
+
+EVENTS_RECEIVED = metrics.counter("argo_events_received_total", "Event bus messages handled", ["event", "status"])
+EVENTS_PUBLISHED = metrics.counter("argo_events_published_total", "Event bus messages published", ["event"])
 
 
 class EventHandler:
@@ -86,17 +91,21 @@ class EventHandler:
 
 
     async def _process_message(self, message):
-        try:
-            event_message = EventMessage.from_json(message["data"])
-            handler = self._handlers.get(event_message.evt)
+        with tracer.span("event"):
+            try:
+                event_message = EventMessage.from_json(message["data"])
+                handler = self._handlers.get(event_message.evt)
 
-            if handler:
-                await handler(event_message.data)
-            else:
-                logger.warning(f"No handler found for event: {event_message.evt}")
+                if handler:
+                    await handler(event_message.data)
+                    EVENTS_RECEIVED.inc(event_message.evt, "ok")
+                else:
+                    EVENTS_RECEIVED.inc("unknown", "unhandled")
+                    logger.warning(f"No handler found for event: {event_message.evt}")
 
-        except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            except Exception as e:
+                EVENTS_RECEIVED.inc("unknown", "error")
+                logger.error(f"Error processing message: {e}")
 
     def add_handler(self, event_type: str, handler: Callable):
         self._handlers[event_type] = handler
@@ -106,6 +115,7 @@ class EventHandler:
         message = EventMessage(evt=evt, data=data)
         try:
             await self._redis.publish("event_bus", message.to_json())
+            EVENTS_PUBLISHED.inc(evt)
         except Exception as e:
             logger.error(f"Error publishing event: {e}")
             raise
\ No newline at end of file
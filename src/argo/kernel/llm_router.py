@@ -0,0 +1,240 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+
+from argo.configs import logger
+from argo.kernel.llm_scheduler import ProviderLane, Priority
+from argo.metrics.tracing import tracer
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """
+    Sliding window of recent latencies used to derive hedge deadlines.
+    """
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self.samples = deque(maxlen=size)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+
+class ChatRoute:
+    def __init__(self, name: str, chat_model: BaseChatModel, lane: ProviderLane, retries: int = 0):
+        self.name = name
+        self.chat_model = chat_model
+        self.lane = lane
+        self.retries = retries
+        # Streams hedge on time to first token, invokes on the whole response
+        self.first_token = LatencyTracker()
+        self.response = LatencyTracker()
+        self.wins = 0
+        self.failures = 0
+
+    def stats(self) -> dict:
+        return {
+            "ttft_p50": self.first_token.quantile(0.5),
+            "ttft_p95": self.first_token.quantile(0.95),
+            "response_p50": self.response.quantile(0.5),
+            "response_p95": self.response.quantile(0.95),
+            "wins": self.wins,
+            "failures": self.failures,
+        }
+
+
+class HedgedRouter:
+    """
+    Routes a request over an ordered list of model routes.
+
+    The primary route is tried first. If it has not produced its first token
+    (or, for invoke, its response) within a deadline derived from its recent
+    p95 latency, the request is hedged to the next route. Until a route has
+    enough samples the deadline is ``hedge_initial_delay``. The first route
+    to respond wins and the others are cancelled. Routes that fail or time
+    out are skipped in favor of the next one.
+    """
+
+    def __init__(
+            self,
+            routes: List[ChatRoute],
+            hedge: bool = True,
+            hedge_quantile: float = 0.95,
+            hedge_min_delay: float = 1.0,
+            hedge_initial_delay: Optional[float] = None,
+            first_token_timeout: float = 30.0
+    ):
+        self.routes = routes
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_initial_delay = hedge_min_delay if hedge_initial_delay is None else hedge_initial_delay
+        self.first_token_timeout = first_token_timeout
+        self.hedges = 0
+
+    def hedge_delay(self, tracker: LatencyTracker) -> Optional[float]:
+        if not self.hedge:
+            return None
+        p = tracker.quantile(self.hedge_quantile)
+        return max(self.hedge_min_delay, p) if p is not None else self.hedge_initial_delay
+
+    async def _race(
+            self,
+            attempt: Callable[[ChatRoute], Awaitable[T]],
+            discard: Callable[[T], Awaitable],
+            tracker: Callable[[ChatRoute], LatencyTracker]
+    ) -> T:
+        pending: Dict[asyncio.Task, ChatRoute] = {}
+        next_route = 0
+        last_error: Optional[BaseException] = None
+
+        def launch() -> ChatRoute:
+            nonlocal next_route
+            route = self.routes[next_route]
+            next_route += 1
+            pending[asyncio.create_task(attempt(route))] = route
+            return route
+
+        latest = launch()
+        try:
+            while pending:
+                timeout = self.hedge_delay(tracker(latest)) if next_route < len(self.routes) else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self.hedges += 1
+                    logger.debug("Hedging request from %s to %s", latest.name, self.routes[next_route].name)
+                    latest = launch()
+                    continue
+
+                winner = None
+                for task in done:
+                    route = pending.pop(task)
+                    if task.exception() is not None:
+                        route.failures += 1
+                        last_error = task.exception()
+                        logger.warning(f"LLM route {route.name} failed: {last_error!r}")
+                    elif winner is None:
+                        route.wins += 1
+                        winner = task.result()
+                    else:
+                        await discard(task.result())
+                if winner is not None:
+                    return winner
+
+                if not pending and next_route < len(self.routes):
+                    latest = launch()
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+            for task in pending:
+                if task.cancelled() or task.exception() is not None:
+                    continue
+                # Finished before it could be cancelled, e.g. an open stream
+                # holding a lane slot
+                try:
+                    await discard(task.result())
+                except Exception as e:
+                    logger.warning(f"Error discarding LLM route result: {e!r}")
+
+    async def ainvoke(self, messages: List[BaseMessage], priority: Priority, tokens: int) -> str:
+        async def invoke(route: ChatRoute):
+            with tracer.span("llm.invoke", route=route.name):
+                start = time.monotonic()
+                response = await route.chat_model.ainvoke(messages)
+                route.response.record(time.monotonic() - start)
+            return response
+
+        async def attempt(route: ChatRoute) -> str:
+            response = await route.lane.call(lambda: invoke(route), priority, tokens, route.retries)
+            return response.content
+
+        async def discard(_):
+            pass
+
+        if len(self.routes) == 1:
+            return await attempt(self.routes[0])
+        return await self._race(attempt, discard, lambda route: route.response)
+
+    async def _route_stream(
+            self,
+            route: ChatRoute,
+            messages: List[BaseMessage],
+            priority: Priority,
+            tokens: int
+    ) -> AsyncGenerator[str, None]:
+        async def open_stream() -> AsyncGenerator[str, None]:
+            span = tracer.start("llm.stream", route=route.name)
+            error = None
+            try:
+                start = time.monotonic()
+                first = True
+                async for chunk in route.chat_model.astream(messages):
+                    if first:
+                        route.first_token.record(time.monotonic() - start)
+                        span.set(ttft=time.monotonic() - start)
+                        first = False
+                    yield chunk.content
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                span.finish(error)
+
+        stream = route.lane.stream(open_stream, priority, tokens, route.retries)
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def astream(self, messages: List[BaseMessage], priority: Priority, tokens: int) -> AsyncGenerator[str, None]:
+        async def attempt(route: ChatRoute) -> Tuple[AsyncGenerator[str, None], Optional[str]]:
+            stream = self._route_stream(route, messages, priority, tokens)
+            try:
+                first = await asyncio.wait_for(stream.__anext__(), self.first_token_timeout)
+            except StopAsyncIteration:
+                return stream, None
+            except BaseException:
+                await stream.aclose()
+                raise
+            return stream, first
+
+        async def discard(result):
+            await result[0].aclose()
+
+        if len(self.routes) == 1:
+            async for chunk in self._route_stream(self.routes[0], messages, priority, tokens):
+                yield chunk
+            return
+
+        stream, first = await self._race(attempt, discard, lambda route: route.first_token)
+        try:
+            if first is None:
+                return
+            yield first
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "hedges": self.hedges,
+            "routes": {route.name: route.stats() for route in self.routes},
+        }
@@ -0,0 +1,251 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from argo.configs import logger
+from argo.env_settings import settings
+from argo.metrics.chat_metrics import current_chat_timer
+from argo.metrics.tracing import tracer
+
+
+T = TypeVar("T")
+
+# Status codes the openai SDK retries; scheduled clients leave retries to the lane
+RETRYABLE_STATUS = {408, 409, 429}
+RETRYABLE_ERRORS = {"APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError"}
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def is_retryable(error: BaseException) -> bool:
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int) and (status in RETRYABLE_STATUS or status >= 500):
+        return True
+    return type(error).__name__ in RETRYABLE_ERRORS
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``per_minute / 60`` per second.
+    A rate of 0 disables the limit.
+    """
+
+    def __init__(self, per_minute: int):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        if self.rate <= 0:
+            return
+        # Requests larger than the whole bucket are let through once it is full
+        amount = min(amount, self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class ProviderLane:
+    """
+    Admission control for one (base_url, model).
+
+    Concurrency is bounded by an AIMD limit: it grows by roughly one slot
+    per window of successful calls and is halved on a 429, which also pauses
+    new calls for a backoff period. Waiters are served by priority, then in
+    arrival order.
+
+    ``call`` and ``stream`` retry failed calls a bounded number of times.
+    Each retry goes back through admission, so it waits out a 429 backoff
+    and counts against the lowered limit, instead of being retried inside
+    the SDK where the lane cannot see it.
+    """
+
+    def __init__(self, key: str, max_concurrency: int, rpm: int, tpm: int):
+        self.key = key
+        self.max_limit = float(max_concurrency)
+        self.limit = float(max_concurrency)
+        self.active = 0
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.backoff = settings.LLM_RATE_LIMIT_BACKOFF
+        self.backoff_until = 0.0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+        self.admitted = 0
+        self.throttled = 0
+        self.retried = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _has_capacity(self) -> bool:
+        return self.active < max(int(self.limit), 1)
+
+    def _wake(self):
+        while self._waiters and self._has_capacity():
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.active += 1
+                future.set_result(None)
+
+    async def _acquire(self, priority: Priority):
+        if self._has_capacity() and not self._waiters:
+            self.active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        self.active -= 1
+        self._wake()
+
+    def on_success(self):
+        if self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._wake()
+
+    def on_rate_limited(self):
+        self.throttled += 1
+        self.limit = max(1.0, self.limit / 2)
+        self.backoff_until = time.monotonic() + self.backoff
+        logger.warning(f"Rate limited by {self.key}, concurrency limit lowered to {int(self.limit)}")
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.INTERACTIVE, tokens: int = 0):
+        queued = time.monotonic()
+        with tracer.span("llm.queue", lane=self.key):
+            await self._acquire(priority)
+        try:
+            with tracer.span("llm.queue", lane=self.key, stage="rate_limit"):
+                delay = self.backoff_until - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self.requests.acquire()
+                await self.tokens.acquire(tokens)
+
+            wait = time.monotonic() - queued
+            self.admitted += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            timer = current_chat_timer.get()
+            if timer:
+                timer.queued(wait)
+
+            try:
+                yield wait
+            except Exception as e:
+                if is_rate_limited(e):
+                    self.on_rate_limited()
+                raise
+            else:
+                self.on_success()
+        finally:
+            self._release()
+
+    async def _before_retry(self, error: BaseException, attempt: int, retries: int) -> bool:
+        if attempt >= retries or not is_retryable(error):
+            return False
+        self.retried += 1
+        logger.info(f"Retrying {self.key} after {type(error).__name__} ({attempt + 1}/{retries})")
+        if not is_rate_limited(error):
+            # A 429 already set the lane backoff, other errors back off per call
+            await asyncio.sleep(min(self.backoff * 2 ** attempt / 4, 8.0))
+        return True
+
+    async def call(
+            self,
+            fn: Callable[[], Awaitable[T]],
+            priority: Priority = Priority.INTERACTIVE,
+            tokens: int = 0,
+            retries: int = 0
+    ) -> T:
+        for attempt in itertools.count():
+            try:
+                async with self.slot(priority, tokens):
+                    return await fn()
+            except Exception as e:
+                if not await self._before_retry(e, attempt, retries):
+                    raise
+
+    async def stream(
+            self,
+            open_stream: Callable[[], AsyncIterator[T]],
+            priority: Priority = Priority.INTERACTIVE,
+            tokens: int = 0,
+            retries: int = 0
+    ) -> AsyncIterator[T]:
+        # Only retried until the first item, a partial response can't be replayed
+        for attempt in itertools.count():
+            started = False
+            try:
+                async with self.slot(priority, tokens):
+                    async for item in open_stream():
+                        started = True
+                        yield item
+                return
+            except Exception as e:
+                if started or not await self._before_retry(e, attempt, retries):
+                    raise
+
+    def stats(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "active": self.active,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "throttled": self.throttled,
+            "retried": self.retried,
+            "avg_wait": self.total_wait / self.admitted if self.admitted else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+
+class LLMScheduler:
+    def __init__(self):
+        self._lanes: Dict[str, ProviderLane] = {}
+
+    def lane(self, base_url: Optional[str], model: Optional[str]) -> ProviderLane:
+        key = f"{base_url or 'default'}|{model or 'default'}"
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = ProviderLane(
+                key,
+                max_concurrency=settings.LLM_MAX_CONCURRENCY,
+                rpm=settings.LLM_REQUESTS_PER_MINUTE,
+                tpm=settings.LLM_TOKENS_PER_MINUTE,
+            )
+            self._lanes[key] = lane
+        return lane
+
+    def stats(self) -> dict:
+        return {key: lane.stats() for key, lane in self._lanes.items()}
+
+
+llm_scheduler = LLMScheduler()
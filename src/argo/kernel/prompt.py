@@ -1,12 +1,19 @@
+import hashlib
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from string import Formatter
+from typing import List, Optional, Tuple
+
+from argo.character.schema import Character
 
 
 class MessageTemplate:
+    _compiled: Optional["CompiledTemplate"] = None
+
     COMPLETION_FOOTER = '''
 Response format should be formatted in a JSON block like this:
 ```json
-{ "user": "{agent_name}", "text": "string", "action": "string" }
+{{ "user": "{agent_name}", "text": "string", "action": "string" }}
 ```'''
 
     MESSAGE_HANDLER_TEMPLATE = '''# Action Examples
@@ -35,6 +42,12 @@ Note that {agent_name} is capable of reading/seeing/hearing various forms of med
 # Instructions: Write the next message for {agent_name}.
 '''
 
+    @classmethod
+    def compiled(cls) -> "CompiledTemplate":
+        if cls._compiled is None:
+            cls._compiled = CompiledTemplate(cls.MESSAGE_HANDLER_TEMPLATE + cls.COMPLETION_FOOTER)
+        return cls._compiled
+
     @classmethod
     def format_template(cls,
                         agent_name: str,
@@ -48,11 +61,9 @@ Note that {agent_name} is capable of reading/seeing/hearing various forms of med
                         actions: str = ""
                         ) -> str:
         """
-
-
+        Render the message handler prompt from the template parsed once per process.
         """
-
-        main_template = cls.MESSAGE_HANDLER_TEMPLATE.format(
+        return cls.compiled().render(
             agent_name=agent_name,
             action_examples=action_examples,
             knowledge=knowledge,
@@ -64,9 +75,137 @@ Note that {agent_name} is capable of reading/seeing/hearing various forms of med
             actions=actions
         )
 
-        footer = cls.COMPLETION_FOOTER.format(agent_name=agent_name)
 
-        return main_template + footer
+class CompiledTemplate:
+    """
+    A ``str.format`` template parsed once into literal and field segments.
+
+    ``bind`` substitutes some fields ahead of time and folds them into the
+    surrounding literals, so rendering only joins the remaining slots.
+    """
+
+    def __init__(self, template: str):
+        self.segments: List[Tuple[str, Optional[str]]] = []
+        for literal, field, format_spec, conversion in Formatter().parse(template):
+            if field is not None and (format_spec or conversion or not field.isidentifier()):
+                raise ValueError(f"Unsupported template field: {field!r}")
+            self.segments.append((literal, field))
+        self.fields = frozenset(field for _, field in self.segments if field is not None)
+
+    @classmethod
+    def _from_segments(cls, segments: List[Tuple[str, Optional[str]]]) -> "CompiledTemplate":
+        template = cls.__new__(cls)
+        template.segments = segments
+        template.fields = frozenset(field for _, field in segments if field is not None)
+        return template
+
+    def bind(self, **values: str) -> "CompiledTemplate":
+        segments = []
+        pending = ""
+        for literal, field in self.segments:
+            pending += literal
+            if field is None:
+                continue
+            if field in values:
+                pending += str(values[field])
+            else:
+                segments.append((pending, field))
+                pending = ""
+        segments.append((pending, None))
+        return self._from_segments(segments)
+
+    def render(self, **values: str) -> str:
+        parts = []
+        for literal, field in self.segments:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(values[field]))
+        return "".join(parts)
+
+
+def build_system_message(character: Character) -> str:
+    system_message_parts = [
+        f"You are {character.name}.",
+        "\nBiography:",
+        *character.bio,
+        "\nLore:",
+        *character.lore,
+        "\nStyle guidelines:",
+        *character.style.all,
+        "\nChat specific style:",
+        *character.style.chat,
+    ]
+
+    if character.adjectives:
+        system_message_parts.extend([
+            "\nKey characteristics:",
+            *[f"- {adj}" for adj in character.adjectives]
+        ])
+
+    return "\n".join(system_message_parts)
+
+
+class CharacterPrompt:
+    """
+    Static prompt parts of one character version, rendered once.
+    """
+
+    def __init__(self, character: Character):
+        self.bio = "\n".join(character.bio)
+        self.lore = "\n".join(character.lore)
+        self.system_message = build_system_message(character)
+        self.message_template = MessageTemplate.compiled().bind(
+            agent_name=character.name,
+            bio=self.bio,
+            lore=self.lore
+        )
+
+    def render(self,
+               action_examples: str = "",
+               knowledge: str = "",
+               attachments: str = "",
+               message_directions: str = "",
+               recent_messages: str = "",
+               actions: str = ""
+               ) -> str:
+        return self.message_template.render(
+            action_examples=action_examples,
+            knowledge=knowledge,
+            attachments=attachments,
+            message_directions=message_directions,
+            recent_messages=recent_messages,
+            actions=actions
+        )
+
+
+class PromptCompiler:
+    """
+    Caches CharacterPrompt objects by a hash of the character content, so
+    agents built for an unchanged character share the rendered static parts.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._cache: "OrderedDict[str, CharacterPrompt]" = OrderedDict()
+
+    @staticmethod
+    def content_hash(character: Character) -> str:
+        return hashlib.sha256(character.model_dump_json().encode("utf-8")).hexdigest()
+
+    def compile(self, character: Character) -> CharacterPrompt:
+        key = self.content_hash(character)
+        prompt = self._cache.get(key)
+        if prompt is None:
+            prompt = CharacterPrompt(character)
+            self._cache[key] = prompt
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return prompt
+
+
+prompt_compiler = PromptCompiler()
 
 
 @dataclass
@@ -2,26 +2,42 @@ import asyncio
 import json
 import os
 import time
-from typing import List
+from typing import Dict, List
 
 from fastapi import APIRouter, FastAPI, Query, Path
 
 from argo.character.character_manager import CharacterManager
+from argo.character.validation import character_loader
+from argo.character.watcher import CharacterWatcher
 from argo.command.command_loader import CommandLoader
 from argo.command.command_manager import CommandManager
 from argo.command.commands import HelpCommandHandler, StatusCommandHandler, ListUsersCommandHandler, CommandContext, \
-    MessageCommandHandler, LoadCharacterCommandHandler, ListAgentsCommandHandler
+    MessageCommandHandler, LoadCharacterCommandHandler, ListAgentsCommandHandler, ClearConversationCommandHandler, \
+    ReloadCharacterCommandHandler
 from argo.configs import logger
 from argo.env_settings import settings
 from argo.kernel.event_handler import EventHandler
 from argo.kernel.schema import WebSocketMessage, MessageType
+from argo.kernel.session import SessionStore
+from argo.kernel.llm_scheduler import llm_scheduler
+from argo.kernel.single_flight import single_flight
+from argo.kernel.startup import StartupGraph
+from argo.kernel.session_backend import RedisSessionBackend
 from argo.cache.redis_manager import RedisManager
+from argo.cache.response_cache import response_cache
 from argo.memory.memory_manager import MemoryManager
+from argo.metrics.chat_metrics import chat_metrics
+from argo.metrics.registry import metrics
+from argo.utils.llm_clients import llm_clients
 from argo.websocket.websocket_manager import WebSocketManager
 from argo.websocket.websocket_handler import setup_websocket
 
 
 
+METRICS_KEY = "worker_metrics"
+CHARACTER_RELOAD_EVENT = "character_reload"
+
+
 class RuntimeState:
     def __init__(self):
         self.worker_id = os.getpid()
@@ -32,13 +48,39 @@ class RuntimeState:
         self.event_handler = EventHandler(self.redis_manager)
         self.command_manager = CommandManager()
         self.ws_manager = WebSocketManager()
-        self.character_manager = CharacterManager()
+        self.character_manager = CharacterManager(self.create_session_store())
         self.memory_manager = MemoryManager()
+        self.character_watcher = None
+        self._reload_tasks = set()
 
         self.routers: List[APIRouter] = []
         self.app = None
+        # Seconds spent in each startup phase, see argo.utils.startup_profile
+        self.startup_phases: Dict[str, float] = {}
+        self.register_metrics()
+
+    def register_metrics(self):
+        metrics.gauge("argo_ws_active_connections", "Open WebSocket connections",
+                      lambda: len(self.ws_manager.active_connections))
+        metrics.gauge("argo_redis_pool_connections", "Redis pool connections by state",
+                      lambda: {("in_use",): self.redis_manager.in_use_size(),
+                               ("available",): self.redis_manager.available_size()},
+                      ["state"])
+        metrics.gauge("argo_sessions", "Conversation sessions held in memory",
+                      lambda: self.character_manager.session_store.size())
+        metrics.gauge("argo_llm_lane_active", "LLM calls in flight per provider lane",
+                      lambda: {(key,): lane["active"] for key, lane in llm_scheduler.stats().items()},
+                      ["lane"])
+        metrics.gauge("argo_llm_lane_queued", "LLM calls waiting per provider lane",
+                      lambda: {(key,): lane["queued"] for key, lane in llm_scheduler.stats().items()},
+                      ["lane"])
 
-    def load_commands(self):
+    def create_session_store(self) -> SessionStore:
+        if settings.SESSION_BACKEND == "redis":
+            return SessionStore(backend=RedisSessionBackend(self.redis_manager))
+        return SessionStore()
+
+    async def load_commands(self):
         logger.info("Loading commands")
         self.command_manager.register("help", HelpCommandHandler(self.command_manager))
         self.command_manager.register("status", StatusCommandHandler())
@@ -46,17 +88,71 @@ class RuntimeState:
         self.command_manager.register("msg", MessageCommandHandler(self.ws_manager))
 
         self.command_manager.register("load_character", LoadCharacterCommandHandler(self))
+        self.command_manager.register("reload", ReloadCharacterCommandHandler(self))
         self.command_manager.register("agents", ListAgentsCommandHandler(self))
+        self.command_manager.register("clear", ClearConversationCommandHandler(self))
 
         for yaml_path in settings.COMMANDS_YAML_PATH:
-            commands = CommandLoader.load_commands(yaml_path)
+            # Reads YAML and imports handler modules, keep it off the event loop
+            commands = await asyncio.to_thread(CommandLoader.load_commands, yaml_path)
             for cmd_name, cmd_info in commands.items():
                 self.command_manager.register(cmd_name, cmd_info['handler'])
 
     async def load_characters(self):
-        logger.info("Loading characters")
-        for filepath in settings.CHARACTERS_PATH:
-            await self.character_manager.load_character(filepath)
+        logger.info(f"Loading {len(settings.CHARACTERS_PATH)} characters")
+        semaphore = asyncio.Semaphore(settings.STARTUP_CHARACTER_CONCURRENCY)
+
+        async def load(filepath: str):
+            async with semaphore:
+                await self.character_manager.load_character(filepath)
+
+        await asyncio.gather(*(load(filepath) for filepath in settings.CHARACTERS_PATH))
+
+    async def reload_character(self, filepath: str, broadcast: bool = True):
+        success, character, message = await self.character_manager.reload_character(filepath)
+        if success and message != "unchanged" and broadcast:
+            try:
+                await self.event_handler.publish_event(
+                    CHARACTER_RELOAD_EVENT,
+                    {"filepath": os.path.abspath(filepath), "worker_id": self.worker_id}
+                )
+            except Exception as e:
+                logger.error(f"Could not broadcast reload of {filepath}: {e}")
+        return success, character, message
+
+    def reloadable_source(self, target: str):
+        """
+        Character file for a reload request, only files from CHARACTERS_PATH
+        or already loaded characters (by name) can be reloaded.
+        """
+        return self.character_manager.find_source(target, settings.CHARACTERS_PATH)
+
+    async def _on_character_reload(self, data: dict):
+        if data.get("worker_id") == self.worker_id:
+            return
+        filepath = self.character_manager.find_source(
+            data["filepath"], [*settings.CHARACTERS_PATH, *self.character_manager.sources]
+        )
+        if filepath is None:
+            logger.warning(f"Ignoring reload of unknown character file {data['filepath']}")
+            return
+        # Building the agent can take a while, don't hold up the event bus
+        task = asyncio.create_task(self.reload_character(filepath, broadcast=False))
+        self._reload_tasks.add(task)
+        task.add_done_callback(self._reload_tasks.discard)
+
+    async def start_character_watcher(self):
+        self.event_handler.add_handler(CHARACTER_RELOAD_EVENT, self._on_character_reload)
+        if not settings.CHARACTER_HOT_RELOAD:
+            return
+        self.character_watcher = CharacterWatcher(
+            settings.CHARACTERS_PATH, self.reload_character, settings.CHARACTER_WATCH_INTERVAL
+        )
+        await self.character_watcher.start()
+
+    async def init_redis(self):
+        await self.redis_manager.init_pool()
+        response_cache.bind_redis(self.redis_manager)
 
 
 
@@ -67,14 +163,23 @@ class RuntimeState:
         logger.info(f"Worker {self.worker_id} starting up...")
         try:
             self.app = app
-            await self.redis_manager.init_pool()
-            await self.memory_manager.init_pool()
-            await self.event_handler.start()
+            start = time.perf_counter()
             setup_websocket(self.app, self)
-            await self.load_characters()
-            self.load_commands()
+
+            graph = StartupGraph(default_timeout=settings.STARTUP_PHASE_TIMEOUT)
+            self.startup_phases = graph.durations
+            graph.add("redis", self.init_redis)
+            graph.add("database", self.memory_manager.init_pool)
+            graph.add("event_bus", self.event_handler.start, depends_on=["redis"])
+            graph.add("commands", self.load_commands)
+            graph.add("characters", self.load_characters,
+                      timeout=settings.STARTUP_CHARACTERS_TIMEOUT)
+            graph.add("character_watcher", self.start_character_watcher, depends_on=["characters", "event_bus"])
+            await graph.run()
+            logger.info(f"Worker {self.worker_id} started in {time.perf_counter() - start:.3f}s")
 
             asyncio.create_task(self._health_check())
+            asyncio.create_task(self._publish_metrics())
             self._initialized = True
 
         except Exception as e:
@@ -85,6 +190,12 @@ class RuntimeState:
     async def shutdown(self):
         logger.info(f"Worker {self.worker_id} Application begins to shutdown...")
 
+        try:
+            if self.character_watcher:
+                await self.character_watcher.stop()
+        except Exception as e:
+            logger.error(f"Error stopping character watcher: {e}")
+
         try:
             if self.event_handler:
                 await self.event_handler.stop()
@@ -97,12 +208,28 @@ class RuntimeState:
         except Exception as e:
             logger.error(f"Error closing Redis connection: {e}")
 
+        try:
+            if self.redis_manager:
+                await self.redis_manager.hdel(METRICS_KEY, str(self.worker_id))
+        except Exception as e:
+            logger.error(f"Error removing worker metrics: {e}")
+
         try:
             if self.redis_manager:
                 await self.redis_manager.close()
         except Exception as e:
             logger.error(f"Error closing Redis connection: {e}")
 
+        try:
+            character_loader.close()
+        except Exception as e:
+            logger.error(f"Error closing character loader: {e}")
+
+        try:
+            await llm_clients.aclose()
+        except Exception as e:
+            logger.error(f"Error closing LLM clients: {e}")
+
         logger.info(f"Worker {self.worker_id} Application shutdown complete")
 
 
@@ -130,13 +257,56 @@ class RuntimeState:
             await asyncio.sleep(self._health_check_interval)
 
 
+    async def _publish_metrics(self):
+        while True:
+            await asyncio.sleep(settings.METRICS_PUBLISH_INTERVAL)
+            try:
+                await self.redis_manager.hset(
+                    METRICS_KEY,
+                    str(self.worker_id),
+                    json.dumps({"time": time.time(), "metrics": metrics.snapshot()})
+                )
+            except Exception as e:
+                logger.error(f"Publishing metrics failed: {e}")
+
+    async def collect_metrics(self) -> str:
+        """
+        Prometheus text exposition of all live workers: this worker's
+        current metrics plus the last snapshot published by every other.
+        """
+        snapshots = [metrics.snapshot()]
+        stale_before = time.time() - settings.METRICS_PUBLISH_INTERVAL * 3
+        workers = 1
+        try:
+            published = await self.redis_manager.hgetall(METRICS_KEY)
+        except Exception as e:
+            logger.error(f"Reading worker metrics failed: {e}")
+            published = {}
+        for worker_id, value in published.items():
+            if worker_id == str(self.worker_id):
+                continue
+            data = json.loads(value)
+            if data["time"] >= stale_before:
+                snapshots.append(data["metrics"])
+                workers += 1
+
+        merged = metrics.merge(snapshots)
+        merged["argo_workers"] = {"type": "gauge", "help": "Workers reporting metrics", "series": {"": workers}}
+        return metrics.render(merged)
+
     async def get_status(self) -> dict:
         return {
             "worker_id": self.worker_id,
             "uptime": time.time() - self.start_time,
             "connections": {
                 "redis": self.redis_manager.size()
-            }
+            },
+            "sessions": self.character_manager.session_store.size(),
+            "llm_cache": response_cache.stats(),
+            "llm_single_flight": single_flight.stats(),
+            "llm_scheduler": llm_scheduler.stats(),
+            "chat": chat_metrics.snapshot(),
+            "startup": self.startup_phases
         }
     def add_router(self, router: APIRouter):
         self.app.include_router(router)
@@ -0,0 +1,226 @@
+import time
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional, Tuple, TYPE_CHECKING
+
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage, AIMessage
+
+from argo.configs import logger
+from argo.env_settings import settings
+from argo.kernel.tokens import count_tokens
+
+if TYPE_CHECKING:
+    from argo.kernel.session_backend import SessionBackend
+
+
+class SessionMessage:
+    """
+    A LangChain message built once when it enters the session, together
+    with its cached token count.
+    """
+    __slots__ = ("message", "tokens", "seq")
+
+    ROLES = {
+        "system": "system",
+        "human": "user",
+        "ai": "assistant",
+    }
+
+    def __init__(self, message: BaseMessage, tokens: Optional[int] = None):
+        self.message = message
+        self.tokens = tokens if tokens is not None else count_tokens(message.content)
+        # Version of the shared session this message was written at
+        self.seq = 0
+
+    @property
+    def role(self) -> str:
+        return self.ROLES.get(self.message.type, self.message.type)
+
+    @property
+    def content(self) -> str:
+        return self.message.content
+
+    @classmethod
+    def from_role(cls, role: str, content: str, tokens: Optional[int] = None) -> "SessionMessage":
+        if role == "system":
+            message = SystemMessage(content=content)
+        elif role == "user":
+            message = HumanMessage(content=content)
+        elif role == "assistant":
+            message = AIMessage(content=content)
+        else:
+            raise ValueError(f"Unsupported message role: {role}")
+        return cls(message, tokens)
+
+
+class ConversationSession:
+    """
+    Conversation state of one user with one agent.
+
+    History is a ring buffer: once ``max_messages`` is reached the oldest
+    message is dropped on every append, so memory and prompt size stay flat.
+    Messages are stored as ready-to-send LangChain objects, so a turn never
+    re-converts the history.
+    """
+
+    def __init__(self, uid: str, agent_id: str, max_messages: int):
+        self.uid = uid
+        self.agent_id = agent_id
+        self.messages: Deque[SessionMessage] = deque(maxlen=max_messages)
+        self.total_tokens = 0
+        self.summary: Optional[SessionMessage] = None
+        self.compacting = False
+        self.version = 0
+        self.last_active = time.monotonic()
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.uid, self.agent_id
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+    def append(self, message: SessionMessage):
+        if self.messages.maxlen == 0:
+            return
+        if len(self.messages) == self.messages.maxlen:
+            self.total_tokens -= self.messages[0].tokens
+        self.messages.append(message)
+        self.total_tokens += message.tokens
+        self.touch()
+
+    def history(self) -> List[SessionMessage]:
+        return list(self.messages)
+
+    def chat_messages(self) -> List[BaseMessage]:
+        return [message.message for message in self.messages]
+
+    def apply_summary(self, summary: str, folded: List[SessionMessage]):
+        """
+        Replace the folded messages by a rolling summary. Messages appended
+        while the summary was being built are kept untouched.
+        """
+        folded_ids = {id(message) for message in folded}
+        while self.messages and id(self.messages[0]) in folded_ids:
+            self.total_tokens -= self.messages.popleft().tokens
+        self.set_summary(summary)
+
+    def set_summary(self, summary: Optional[str]):
+        self.summary = SessionMessage.from_role(
+            "system",
+            f"Summary of the earlier conversation:\n{summary}"
+        ) if summary else None
+
+    def clear(self):
+        self.messages.clear()
+        self.total_tokens = 0
+        self.summary = None
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+
+class SessionStore:
+    """
+    Session store keyed by (uid, agent_id).
+
+    Sessions are kept in LRU order. Sessions idle for longer than ``ttl``
+    seconds are evicted lazily, and the least recently used session is
+    evicted once ``max_sessions`` is exceeded.
+
+    With a ``backend`` the local sessions become a write-through cache of
+    the shared store: a local session is reused only while its version
+    matches the backend, otherwise it is reloaded.
+    """
+
+    def __init__(
+            self,
+            max_sessions: Optional[int] = None,
+            ttl: Optional[float] = None,
+            backend: Optional["SessionBackend"] = None
+    ):
+        self.max_sessions = max_sessions if max_sessions is not None else settings.SESSION_MAX_COUNT
+        self.ttl = ttl if ttl is not None else settings.SESSION_IDLE_TTL
+        self.backend = backend
+        self._sessions: "OrderedDict[Tuple[str, str], ConversationSession]" = OrderedDict()
+
+    async def get_session(self, uid: str, agent_id: str, max_messages: int) -> ConversationSession:
+        self._evict_expired()
+
+        key = (uid, agent_id)
+        session = self._sessions.get(key)
+        if self.backend:
+            if session is None or session.version != await self.backend.version(key):
+                session = await self._load(uid, agent_id, max_messages)
+                self._sessions[key] = session
+        if session is None or session.messages.maxlen != max_messages:
+            session = self._resize(session, uid, agent_id, max_messages)
+            self._sessions[key] = session
+
+        self._sessions.move_to_end(key)
+        session.touch()
+        self._evict_overflow()
+        return session
+
+    async def append(self, session: ConversationSession, *messages: SessionMessage):
+        for message in messages:
+            session.append(message)
+        if self.backend and session.messages.maxlen:
+            version = await self.backend.append(session.key, list(messages), session.messages.maxlen)
+            # Another worker wrote in between, reload on next access
+            session.version = version if version == session.version + 1 else -1
+
+    async def apply_summary(self, session: ConversationSession, summary: str, folded: List[SessionMessage]):
+        session.apply_summary(summary, folded)
+        if self.backend:
+            version = await self.backend.save_summary(session.key, summary, max(m.seq for m in folded))
+            session.version = version if version == session.version + 1 else -1
+
+    async def remove(self, uid: str, agent_id: str) -> bool:
+        removed = self._sessions.pop((uid, agent_id), None) is not None
+        if self.backend:
+            # The local copy is only a cache of the shared session
+            return await self.backend.clear((uid, agent_id))
+        return removed
+
+    async def _load(self, uid: str, agent_id: str, max_messages: int) -> ConversationSession:
+        version, messages, summary = await self.backend.load((uid, agent_id))
+        session = ConversationSession(uid, agent_id, max_messages)
+        for message in messages:
+            session.append(message)
+        session.set_summary(summary)
+        session.version = version
+        return session
+
+    def size(self) -> int:
+        return len(self._sessions)
+
+    @staticmethod
+    def _resize(
+            session: Optional[ConversationSession],
+            uid: str,
+            agent_id: str,
+            max_messages: int
+    ) -> ConversationSession:
+        new_session = ConversationSession(uid, agent_id, max_messages)
+        if session is not None:
+            for message in session.messages:
+                new_session.append(message)
+            new_session.summary = session.summary
+            new_session.version = session.version
+        return new_session
+
+    def _evict_expired(self):
+        if self.ttl <= 0:
+            return
+        deadline = time.monotonic() - self.ttl
+        while self._sessions:
+            key, session = next(iter(self._sessions.items()))
+            if session.last_active > deadline:
+                break
+            del self._sessions[key]
+            logger.debug(f"Evicted idle session {key}")
+
+    def _evict_overflow(self):
+        while self.max_sessions > 0 and len(self._sessions) > self.max_sessions:
+            key, _ = self._sessions.popitem(last=False)
+            logger.debug(f"Evicted least recently used session {key}")
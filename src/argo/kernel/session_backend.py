@@ -0,0 +1,146 @@
+from typing import List, Optional, Tuple
+
+from argo.cache.redis_manager import RedisManager
+from argo.configs import logger
+from argo.env_settings import settings
+from argo.kernel.session import SessionMessage
+
+# Serialized turn: "<seq>|<role code>|<tokens>|<content>"
+ROLE_CODES = {
+    "system": "s",
+    "user": "u",
+    "assistant": "a",
+}
+CODE_ROLES = {code: role for role, code in ROLE_CODES.items()}
+
+# KEYS: messages list, meta hash. ARGV: max messages, ttl, serialized turns without seq
+APPEND_SCRIPT = """
+local version = redis.call('HINCRBY', KEYS[2], 'version', 1)
+for i = 3, #ARGV do
+    redis.call('RPUSH', KEYS[1], version .. '|' .. ARGV[i])
+end
+redis.call('LTRIM', KEYS[1], -tonumber(ARGV[1]), -1)
+if tonumber(ARGV[2]) > 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    redis.call('EXPIRE', KEYS[2], ARGV[2])
+end
+return version
+"""
+
+# KEYS: messages list, meta hash. ARGV: summary, folded seq, ttl
+SUMMARY_SCRIPT = """
+local folded = tonumber(ARGV[2])
+while true do
+    local head = redis.call('LINDEX', KEYS[1], 0)
+    if not head then break end
+    local seq = tonumber(string.match(head, '^(%d+)|'))
+    if seq == nil or seq > folded then break end
+    redis.call('LPOP', KEYS[1])
+end
+redis.call('HSET', KEYS[2], 'summary', ARGV[1], 'folded', ARGV[2])
+local version = redis.call('HINCRBY', KEYS[2], 'version', 1)
+if tonumber(ARGV[3]) > 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+end
+return version
+"""
+
+
+class SessionBackend:
+    """
+    Shared storage behind a SessionStore. Every write bumps a version number
+    so workers can tell whether their local copy of a session is current.
+    """
+
+    async def version(self, key: Tuple[str, str]) -> int:
+        raise NotImplementedError
+
+    async def load(
+            self,
+            key: Tuple[str, str]
+    ) -> Tuple[int, List[SessionMessage], Optional[str]]:
+        raise NotImplementedError
+
+    async def append(self, key: Tuple[str, str], messages: List[SessionMessage], max_messages: int) -> int:
+        raise NotImplementedError
+
+    async def save_summary(self, key: Tuple[str, str], summary: str, folded_seq: int) -> int:
+        raise NotImplementedError
+
+    async def clear(self, key: Tuple[str, str]) -> bool:
+        """Delete the session, returns whether there was one."""
+        raise NotImplementedError
+
+
+class RedisSessionBackend(SessionBackend):
+    """
+    Sessions stored in Redis as a capped list of compact serialized turns
+    plus a meta hash holding the version and the rolling summary.
+    """
+
+    def __init__(self, redis_manager: RedisManager, ttl: Optional[int] = None):
+        self._redis_manager = redis_manager
+        self.ttl = ttl if ttl is not None else settings.SESSION_REDIS_TTL
+
+    @staticmethod
+    def _keys(key: Tuple[str, str]) -> Tuple[str, str]:
+        uid, agent_id = key
+        return f"session:{agent_id}:{uid}", f"session_meta:{agent_id}:{uid}"
+
+    @staticmethod
+    def serialize(message: SessionMessage) -> str:
+        return f"{ROLE_CODES[message.role]}|{message.tokens}|{message.content}"
+
+    @staticmethod
+    def deserialize(item: str) -> SessionMessage:
+        seq, code, tokens, content = item.split("|", 3)
+        message = SessionMessage.from_role(CODE_ROLES[code], content, int(tokens))
+        message.seq = int(seq)
+        return message
+
+    async def version(self, key: Tuple[str, str]) -> int:
+        _, meta_key = self._keys(key)
+        version = await self._redis_manager.hget(meta_key, "version")
+        return int(version) if version else 0
+
+    async def load(
+            self,
+            key: Tuple[str, str]
+    ) -> Tuple[int, List[SessionMessage], Optional[str]]:
+        list_key, meta_key = self._keys(key)
+        async with self._redis_manager.get_connection() as redis:
+            async with redis.pipeline(transaction=True) as pipe:
+                meta, items = await pipe.hgetall(meta_key).lrange(list_key, 0, -1).execute()
+
+        folded = int(meta.get("folded", 0))
+        messages = []
+        for item in items:
+            try:
+                message = self.deserialize(item)
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Skipping malformed session entry in {list_key}: {e}")
+                continue
+            if message.seq > folded:
+                messages.append(message)
+        return int(meta.get("version", 0)), messages, meta.get("summary")
+
+    async def append(self, key: Tuple[str, str], messages: List[SessionMessage], max_messages: int) -> int:
+        list_key, meta_key = self._keys(key)
+        async with self._redis_manager.get_connection() as redis:
+            version = await redis.eval(
+                APPEND_SCRIPT, 2, list_key, meta_key,
+                max(max_messages, 1), self.ttl,
+                *[self.serialize(message) for message in messages]
+            )
+        for message in messages:
+            message.seq = version
+        return version
+
+    async def save_summary(self, key: Tuple[str, str], summary: str, folded_seq: int) -> int:
+        list_key, meta_key = self._keys(key)
+        async with self._redis_manager.get_connection() as redis:
+            return await redis.eval(SUMMARY_SCRIPT, 2, list_key, meta_key, summary, folded_seq, self.ttl)
+
+    async def clear(self, key: Tuple[str, str]) -> bool:
+        return await self._redis_manager.delete(*self._keys(key)) > 0
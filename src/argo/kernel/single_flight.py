@@ -0,0 +1,130 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from argo.configs import logger
+
+
+class StreamFanout:
+    """
+    Buffers the chunks of one upstream stream so any number of subscribers
+    can replay it from the start, including subscribers that join late.
+    Once every subscriber has left, the upstream stream is cancelled so it
+    stops using the provider.
+    """
+
+    def __init__(self, source: AsyncIterator[str], on_done: Optional[Callable[[], None]] = None):
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self._source = source
+        self._on_done = on_done
+        self._changed = asyncio.Event()
+        self._task = asyncio.create_task(self._pump())
+
+    def _notify(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _finish(self):
+        if not self.done:
+            self.done = True
+            if self._on_done:
+                self._on_done()
+        self._notify()
+
+    async def _pump(self):
+        try:
+            async for chunk in self._source:
+                self.chunks.append(chunk)
+                self._notify()
+        except Exception as e:
+            self.error = e
+        finally:
+            self._finish()
+            # Runs the source's cleanup (e.g. releasing its lane slot) even
+            # when the pump was cancelled before the source started
+            await self._source.aclose()
+
+    def cancel(self):
+        self._finish()
+        self._task.cancel()
+
+    def subscribe(self) -> AsyncIterator[str]:
+        self.subscribers += 1
+        return self._subscribe()
+
+    async def _subscribe(self) -> AsyncIterator[str]:
+        index = 0
+        try:
+            while True:
+                if index < len(self.chunks):
+                    chunk = self.chunks[index]
+                    index += 1
+                    yield chunk
+                    continue
+                if self.done:
+                    if self.error:
+                        raise self.error
+                    return
+                await self._changed.wait()
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done:
+                logger.debug("Every subscriber left, cancelling upstream stream")
+                self.cancel()
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent requests: while a call for a key is in
+    flight, later callers with the same key wait for its result (or
+    subscribe to its stream) instead of starting their own.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._streams: Dict[str, StreamFanout] = {}
+        self.coalesced = 0
+
+    def _call_done(self, key: str, task: asyncio.Task):
+        self._calls.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter went away
+            task.exception()
+
+    def _stream_done(self, key: str, fanout: StreamFanout):
+        # A newer stream may already be registered under the same key
+        if self._streams.get(key) is fanout:
+            del self._streams[key]
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            # The upstream call runs in its own task, so a cancelled caller
+            # does not cancel it for the others
+            task = asyncio.create_task(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._call_done(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stream(self, key: str, factory: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        fanout = self._streams.get(key)
+        if fanout is None:
+            fanout = StreamFanout(factory(), on_done=lambda: self._stream_done(key, fanout))
+            self._streams[key] = fanout
+        else:
+            self.coalesced += 1
+            logger.debug("Joined in-flight stream %s", key)
+        return fanout.subscribe()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._calls) + len(self._streams),
+            "coalesced": self.coalesced,
+        }
+
+
+single_flight = SingleFlight()
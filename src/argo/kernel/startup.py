@@ -0,0 +1,68 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+from argo.configs import logger
+
+
+class StartupPhase:
+    def __init__(
+            self,
+            name: str,
+            fn: Callable[[], Awaitable],
+            depends_on: Sequence[str] = (),
+            timeout: Optional[float] = None
+    ):
+        self.name = name
+        self.fn = fn
+        self.depends_on = list(depends_on)
+        self.timeout = timeout
+
+
+class StartupGraph:
+    """
+    Runs startup phases as a dependency graph: every phase starts as soon
+    as the phases it depends on are done, so independent phases overlap.
+    A phase that fails or exceeds its timeout cancels the whole startup.
+    """
+
+    def __init__(self, default_timeout: Optional[float] = None):
+        self.default_timeout = default_timeout
+        self.phases: Dict[str, StartupPhase] = {}
+        # Seconds each phase took, excluding time waiting on dependencies
+        self.durations: Dict[str, float] = {}
+
+    def add(self, name: str, fn: Callable[[], Awaitable], depends_on: Sequence[str] = (), timeout: Optional[float] = None):
+        for dependency in depends_on:
+            if dependency not in self.phases:
+                raise ValueError(f"Startup phase {name} depends on unknown phase {dependency}")
+        self.phases[name] = StartupPhase(name, fn, depends_on, timeout or self.default_timeout)
+
+    async def _run_phase(self, phase: StartupPhase, tasks: Dict[str, asyncio.Task]):
+        if phase.depends_on:
+            await asyncio.gather(*(tasks[dependency] for dependency in phase.depends_on))
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(phase.fn(), phase.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Startup phase {phase.name} timed out after {phase.timeout}s")
+        finally:
+            self.durations[phase.name] = time.perf_counter() - start
+        logger.info(f"Startup phase {phase.name} done in {self.durations[phase.name]:.3f}s")
+
+    async def run(self):
+        # Phases can only depend on earlier ones, so the graph is acyclic
+        tasks: Dict[str, asyncio.Task] = {}
+        for name, phase in self.phases.items():
+            tasks[name] = asyncio.create_task(self._run_phase(phase, tasks), name=f"startup:{name}")
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            pending: List[asyncio.Task] = [task for task in tasks.values() if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for task in tasks.values():
+                if not task.cancelled():
+                    # Dependents re-raise the same error, mark every one retrieved
+                    task.exception()
@@ -0,0 +1,65 @@
+from functools import lru_cache
+from itertools import islice
+from typing import List, Optional, Sequence, TYPE_CHECKING
+
+from argo.configs import logger
+
+if TYPE_CHECKING:
+    from argo.kernel.session import SessionMessage
+
+# Fixed per-message cost of role markers and separators in chat formats
+MESSAGE_TOKEN_OVERHEAD = 4
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable, falling back to estimated token counts: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return MESSAGE_TOKEN_OVERHEAD
+    encoding = _get_encoding()
+    if encoding is None:
+        # Roughly 4 characters per token for English text
+        return len(text) // 4 + 1 + MESSAGE_TOKEN_OVERHEAD
+    return len(encoding.encode(text, disallowed_special=())) + MESSAGE_TOKEN_OVERHEAD
+
+
+def prompt_budget(context_window: int, max_tokens: Optional[int]) -> int:
+    """
+    Tokens available for the prompt once the completion has been reserved.
+    """
+    return max(context_window - (max_tokens or 0), 0)
+
+
+def fit_history(
+        history: Sequence["SessionMessage"],
+        budget: int,
+        reserved: int = 0
+) -> List["SessionMessage"]:
+    """
+    Return the newest suffix of ``history`` that fits into ``budget`` tokens
+    minus ``reserved`` (system message and current user message).
+
+    Oldest messages are dropped first, and a leading assistant message is
+    dropped with its user turn so the window always starts on a user turn.
+    """
+    remaining = budget - reserved
+    start = len(history)
+    while start > 0:
+        tokens = history[start - 1].tokens
+        if tokens > remaining:
+            break
+        remaining -= tokens
+        start -= 1
+
+    while start < len(history) and history[start].role == "assistant":
+        start += 1
+
+    return list(islice(history, start, None))
@@ -5,10 +5,12 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.routing import APIWebSocketRoute
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, PlainTextResponse
 
+from argo.client.rest.router import router as agent_router
 from argo.kernel.schema import GenericResponse
 from argo.kernel.runtime_state import runtime
+from argo.metrics.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +42,7 @@ async def lifespan(instance: FastAPI):
             logger.info("Application shutdown complete")
 
 app = FastAPI(lifespan=lifespan)
+app.include_router(agent_router)
 
 
 
@@ -72,6 +75,20 @@ async def validation_exception_handler(request, exc):
     )
 
 
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(
+        await runtime.collect_metrics(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/admin/traces")
+async def get_traces(limit: int = 100, min_duration_ms: float = 0.0):
+    # Load the response in chrome://tracing or ui.perfetto.dev
+    return tracer.chrome_trace(limit, min_duration_ms / 1000)
+
+
 @app.get("/status")
 async def get_status():
     worker_status = await runtime.redis_manager.hgetall("worker_status")
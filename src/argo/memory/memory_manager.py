@@ -1,13 +1,12 @@
 import asyncio
-from typing import List, Type
+from typing import List, Type, TYPE_CHECKING
 
-import motor
-from beanie import init_beanie, Document
-
-from argo.apps.common.model import OpLog
 from argo.configs import logger
 from argo.env_settings import settings
 
+if TYPE_CHECKING:
+    from beanie import Document
+
 
 class MemoryManager:
     """
@@ -23,6 +22,9 @@ class MemoryManager:
         if self.db is None:
             async with self._lock:
                 if self.db is None:
+                    # motor and beanie are imported on first use to keep worker imports fast
+                    import motor.motor_asyncio
+
                     self.client = motor.motor_asyncio.AsyncIOMotorClient(
                         settings.DATABASE_URL,
                     )
@@ -41,6 +43,9 @@ class MemoryManager:
             logger.error(f"Error while closing database connection: {e}")
 
     async def init_models(self):
+        from beanie import init_beanie
+        from argo.apps.common.model import OpLog
+
         try:
             await init_beanie(database=self.db, document_models=[
                 OpLog,
@@ -68,7 +73,9 @@ class MemoryManager:
             return 0
         return self.client.options.pool_options.max_pool_size
 
-    async def register_models(self, models: List[Type[Document]]):
+    async def register_models(self, models: List[Type["Document"]]):
+        from beanie import init_beanie
+
         try:
             await init_beanie(database=self.db, document_models=models)
             logger.info(f"Registered models: {models}")
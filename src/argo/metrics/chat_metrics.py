@@ -0,0 +1,143 @@
+import time
+from contextvars import ContextVar, Token
+from typing import Dict, Optional, Tuple
+
+from argo.metrics.histogram import Histogram
+from argo.metrics.registry import metrics, TOKEN_BUCKETS
+
+LLM_REQUESTS = metrics.counter(
+    "argo_llm_requests_total", "Agent chat requests by outcome", ["agent", "model", "outcome"]
+)
+
+
+class ChatStats:
+    """
+    Timing and size histograms of the chat requests of one (agent, model).
+    """
+
+    def __init__(self):
+        self.queue_time = Histogram()
+        self.ttft = Histogram()
+        self.inter_token = Histogram()
+        self.duration = Histogram()
+        self.tokens_per_second = Histogram()
+        self.prompt_tokens = Histogram()
+        self.completion_tokens = Histogram()
+        self.requests = 0
+        self.errors: Dict[str, int] = {}
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "queue_time": self.queue_time.snapshot(),
+            "ttft": self.ttft.snapshot(),
+            "inter_token": self.inter_token.snapshot(),
+            "duration": self.duration.snapshot(),
+            "tokens_per_second": self.tokens_per_second.snapshot(),
+            "prompt_tokens": self.prompt_tokens.snapshot(),
+            "completion_tokens": self.completion_tokens.snapshot(),
+        }
+
+
+class ChatTimer:
+    """
+    Measures one chat request. Inter-token gaps go straight into the
+    histogram; everything else is recorded by ``finish``, which also
+    restores the ``current_chat_timer`` the timer replaced.
+    """
+
+    def __init__(self, key: Tuple[str, str], stats: ChatStats, prompt_tokens: int = 0):
+        self.key = key
+        self.stats = stats
+        self.prompt_tokens = prompt_tokens
+        self.start = time.monotonic()
+        self.queue_time: Optional[float] = None
+        self.first_token: Optional[float] = None
+        self.last_token: Optional[float] = None
+        self.context_token: Optional[Token] = None
+
+    def queued(self, seconds: float):
+        # With hedging several attempts queue; the first admission counts
+        if self.queue_time is None:
+            self.queue_time = seconds
+
+    def token(self):
+        now = time.monotonic()
+        if self.first_token is None:
+            self.first_token = now
+        else:
+            self.stats.inter_token.record(now - self.last_token)
+        self.last_token = now
+
+    def finish(self, completion_tokens: int, error: Optional[BaseException] = None):
+        # Only the context that installed the timer can reset it
+        if self.context_token is not None and current_chat_timer.get() is self:
+            current_chat_timer.reset(self.context_token)
+            self.context_token = None
+        stats = self.stats
+        end = time.monotonic()
+        stats.requests += 1
+        if error is not None:
+            name = type(error).__name__
+            stats.errors[name] = stats.errors.get(name, 0) + 1
+            LLM_REQUESTS.inc(*self.key, name)
+            return
+        LLM_REQUESTS.inc(*self.key, "ok")
+        if self.first_token is None:
+            self.first_token = end
+        stats.duration.record(end - self.start)
+        stats.ttft.record(self.first_token - self.start)
+        if self.queue_time is not None:
+            stats.queue_time.record(self.queue_time)
+        stats.prompt_tokens.record(self.prompt_tokens)
+        stats.completion_tokens.record(completion_tokens)
+        if end > self.first_token:
+            stats.tokens_per_second.record(completion_tokens / (end - self.first_token))
+
+
+current_chat_timer: ContextVar[Optional[ChatTimer]] = ContextVar("current_chat_timer", default=None)
+
+
+class ChatMetrics:
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str], ChatStats] = {}
+
+    def timer(self, agent: str, model: Optional[str], prompt_tokens: int = 0) -> ChatTimer:
+        key = (agent, model or "default")
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = ChatStats()
+        timer = ChatTimer(key, stats, prompt_tokens)
+        # Lets the LLM scheduler report queue time without threading the
+        # timer through the handler, cache and router, until finish()
+        timer.context_token = current_chat_timer.set(timer)
+        return timer
+
+    def items(self):
+        return self._stats.items()
+
+    def histograms(self, field: str):
+        return [(key, getattr(stats, field)) for key, stats in self._stats.items()]
+
+    def snapshot(self) -> dict:
+        return {f"{agent}|{model}": stats.snapshot() for (agent, model), stats in self._stats.items()}
+
+
+chat_metrics = ChatMetrics()
+
+for _field, _documentation, _buckets in (
+        ("queue_time", "Time spent waiting for an LLM provider slot", None),
+        ("ttft", "Time from request to first token", None),
+        ("inter_token", "Gap between streamed tokens", None),
+        ("duration", "Total duration of agent chat requests", None),
+        ("prompt_tokens", "Prompt size of agent chat requests", TOKEN_BUCKETS),
+        ("completion_tokens", "Completion size of agent chat requests", TOKEN_BUCKETS),
+):
+    metrics.histogram(
+        f"argo_llm_{_field}_seconds" if _buckets is None else f"argo_llm_{_field}",
+        _documentation,
+        ["agent", "model"],
+        source=lambda field=_field: chat_metrics.histograms(field),
+        **({"buckets": _buckets} if _buckets else {})
+    )
@@ -0,0 +1,113 @@
+import math
+from typing import Dict, List, Optional
+
+
+class Histogram:
+    """
+    HDR-style histogram with log-linear buckets.
+
+    Each power of two is split into ``2 ** precision`` linear sub-buckets,
+    so any recorded value is reproduced within a relative error of
+    ``2 ** -precision`` while memory stays proportional to the value range
+    actually seen. Recording is a dict increment and never awaits, so it is
+    safe to call from any coroutine without a lock.
+    """
+
+    def __init__(self, precision: int = 5):
+        self.sub_buckets = 1 << precision
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _index(self, value: float) -> int:
+        if value <= 0:
+            return -(1 << 30)
+        mantissa, exponent = math.frexp(value)
+        return exponent * self.sub_buckets + int((mantissa - 0.5) * 2 * self.sub_buckets)
+
+    def _value(self, index: int) -> float:
+        if index == -(1 << 30):
+            return 0.0
+        exponent, sub = divmod(index, self.sub_buckets)
+        # Midpoint of the bucket
+        return math.ldexp(0.5 + (sub + 0.5) / (2 * self.sub_buckets), exponent)
+
+    def record(self, value: float):
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram"):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def cumulative(self, bounds: List[float]) -> List[int]:
+        """
+        Number of values at or below each of the ascending ``bounds``.
+        """
+        counts = [0] * len(bounds)
+        for index, count in self.counts.items():
+            value = self._value(index)
+            for i, bound in enumerate(bounds):
+                if value <= bound:
+                    counts[i] += count
+                    break
+        for i in range(1, len(counts)):
+            counts[i] += counts[i - 1]
+        return counts
+
+    def to_dict(self) -> dict:
+        return {
+            "precision": self.sub_buckets.bit_length() - 1,
+            "counts": self.counts,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Histogram":
+        histogram = cls(data["precision"])
+        histogram.counts = {int(index): count for index, count in data["counts"].items()}
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        if data["count"]:
+            histogram.min = data["min"]
+            histogram.max = data["max"]
+        return histogram
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "p50": self.quantile(0.50),
+            "p90": self.quantile(0.90),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
@@ -0,0 +1,169 @@
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from argo.metrics.histogram import Histogram
+
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+TOKEN_BUCKETS = [16, 64, 256, 1024, 4096, 16384, 65536]
+
+GaugeValue = Union[float, Dict[Tuple[str, ...], float]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def collect(self) -> dict:
+        return {format_labels(self.labelnames, labels): value for labels, value in self.values.items()}
+
+
+class Gauge:
+    """
+    Gauge read at collection time. ``fn`` returns either a single value or
+    a mapping of label values to values.
+    """
+
+    def __init__(self, name: str, documentation: str, fn: Callable[[], GaugeValue], labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.fn = fn
+
+    def collect(self) -> dict:
+        value = self.fn()
+        if isinstance(value, dict):
+            return {format_labels(self.labelnames, labels): v for labels, v in value.items()}
+        return {"": value}
+
+
+class HistogramMetric:
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = LATENCY_BUCKETS,
+            source: Optional[Callable[[], Iterable[Tuple[Tuple[str, ...], Histogram]]]] = None
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = list(buckets)
+        self.histograms: Dict[Tuple[str, ...], Histogram] = {}
+        # Histograms owned elsewhere (e.g. chat metrics) can be exported as-is
+        self.source = source
+
+    def observe(self, *labels: str, value: float):
+        histogram = self.histograms.get(labels)
+        if histogram is None:
+            histogram = self.histograms[labels] = Histogram()
+        histogram.record(value)
+
+    def collect(self) -> dict:
+        items = self.source() if self.source else self.histograms.items()
+        return {format_labels(self.labelnames, labels): histogram.to_dict() for labels, histogram in items}
+
+
+class MetricsRegistry:
+    """
+    In-process metrics of one worker, exported in the Prometheus text format.
+
+    ``snapshot`` produces a JSON-serializable view that workers publish to
+    Redis, and ``merge`` sums the snapshots of all workers, so any worker
+    can serve /metrics for the whole deployment.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Union[Counter, Gauge, HistogramMetric]] = {}
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, fn: Callable[[], GaugeValue], labelnames: Sequence[str] = ()) -> Gauge:
+        # Gauges capture live objects, re-registering replaces the old callback
+        self._metrics.pop(name, None)
+        return self._register(Gauge(name, documentation, fn, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), **kwargs) -> HistogramMetric:
+        return self._register(HistogramMetric(name, documentation, labelnames, **kwargs))
+
+    def snapshot(self) -> dict:
+        snapshot = {}
+        for name, metric in self._metrics.items():
+            entry = {"help": metric.documentation, "series": metric.collect()}
+            if isinstance(metric, Counter):
+                entry["type"] = "counter"
+            elif isinstance(metric, Gauge):
+                entry["type"] = "gauge"
+            else:
+                entry["type"] = "histogram"
+                entry["buckets"] = metric.buckets
+            snapshot[name] = entry
+        return snapshot
+
+    @staticmethod
+    def merge(snapshots: List[dict]) -> dict:
+        merged: Dict[str, dict] = {}
+        for snapshot in snapshots:
+            for name, entry in snapshot.items():
+                target = merged.setdefault(name, {**entry, "series": {}})
+                for labels, value in entry["series"].items():
+                    if entry["type"] == "histogram":
+                        histogram = Histogram.from_dict(value)
+                        if labels in target["series"]:
+                            target["series"][labels].merge(histogram)
+                        else:
+                            target["series"][labels] = histogram
+                    else:
+                        target["series"][labels] = target["series"].get(labels, 0.0) + value
+        return merged
+
+    @staticmethod
+    def render(merged: dict) -> str:
+        lines = []
+        for name, entry in sorted(merged.items()):
+            lines.append(f"# HELP {name} {entry['help']}")
+            lines.append(f"# TYPE {name} {entry['type']}")
+            for labels, value in entry["series"].items():
+                if entry["type"] != "histogram":
+                    lines.append(f"{name}{{{labels}}} {_format_value(value)}" if labels
+                                 else f"{name} {_format_value(value)}")
+                    continue
+                prefix = labels + "," if labels else ""
+                bounds = entry["buckets"]
+                for bound, count in zip(bounds + [math.inf], value.cumulative(bounds) + [value.count]):
+                    lines.append(f'{name}_bucket{{{prefix}le="{_format_value(bound)}"}} {count}')
+                suffix = f"{{{labels}}}" if labels else ""
+                lines.append(f"{name}_sum{suffix} {_format_value(value.total)}")
+                lines.append(f"{name}_count{suffix} {value.count}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,176 @@
+import itertools
+import os
+import random
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Deque, List, Optional
+
+from argo.env_settings import settings
+
+
+class Trace:
+    def __init__(self, trace_id: int):
+        self.trace_id = trace_id
+        self.spans: List["Span"] = []
+        self.root: Optional["Span"] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.root.end - self.root.start) / 1e9 if self.root else 0.0
+
+
+class Span:
+    """
+    One timed stage of a request. Usable as a sync or async context
+    manager; the span becomes the parent of spans opened inside it.
+    Async generators must not hold it open across a yield, they use
+    ``Tracer.start`` instead.
+    """
+
+    __slots__ = ("tracer", "name", "attrs", "trace", "span_id", "parent_id", "start", "end", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, trace: Trace, parent_id: Optional[int], attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.trace = trace
+        self.span_id = next(tracer.ids)
+        self.parent_id = parent_id
+        self.start = 0
+        self.end = 0
+        self._token = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def begin(self) -> "Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def finish(self, error: Optional[BaseException] = None):
+        self.end = time.perf_counter_ns()
+        if error is not None:
+            self.attrs["error"] = type(error).__name__
+        self.tracer._finish(self)
+
+    def __enter__(self):
+        self.begin()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish(exc)
+        _current_span.reset(self._token)
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.__exit__(exc_type, exc, tb)
+
+
+class _NoopSpan:
+    """
+    Stands in for spans of requests that were not sampled, so nested
+    spans of the same request are skipped as well.
+    """
+
+    __slots__ = ("_token",)
+
+    def set(self, **attrs):
+        pass
+
+    def finish(self, error: Optional[BaseException] = None):
+        pass
+
+    def __enter__(self):
+        self._token = _current_span.set(NOT_SAMPLED)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.__exit__(exc_type, exc, tb)
+
+
+class _SharedNoopSpan(_NoopSpan):
+    # Nested spans of an unsampled request keep NOT_SAMPLED as is
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+_NOOP = _SharedNoopSpan()
+NOT_SAMPLED = object()
+_current_span: ContextVar[object] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Dependency-free request tracer.
+
+    A span opened with no active span starts a new trace, sampled with
+    probability ``sample_rate``. Spans propagate through contextvars, so
+    tasks created inside a span join its trace. Completed traces are kept
+    in a ring buffer of ``buffer_size`` and can be exported in the Chrome
+    trace-event format (chrome://tracing, Perfetto).
+    """
+
+    def __init__(self, sample_rate: float, buffer_size: int):
+        self.sample_rate = sample_rate
+        self.traces: Deque[Trace] = deque(maxlen=buffer_size)
+        self.ids = itertools.count(1)
+
+    def span(self, name: str, **attrs):
+        parent = _current_span.get()
+        if parent is NOT_SAMPLED:
+            return _NOOP
+        if parent is None:
+            if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+                return _NoopSpan()
+            return Span(self, name, Trace(next(self.ids)), None, attrs)
+        return Span(self, name, parent.trace, parent.span_id, attrs)
+
+    def start(self, name: str, **attrs):
+        """
+        Start a span without making it the current one, for stages that
+        yield to their caller. The caller ends it with ``finish``; spans
+        opened meanwhile belong to the enclosing span instead.
+        """
+        span = self.span(name, **attrs)
+        return span.begin() if isinstance(span, Span) else _NOOP
+
+    def _finish(self, span: Span):
+        span.trace.spans.append(span)
+        if span.parent_id is None:
+            span.trace.root = span
+            self.traces.append(span.trace)
+
+    def chrome_trace(self, limit: int = 100, min_duration: float = 0.0) -> dict:
+        traces = [trace for trace in self.traces if trace.duration >= min_duration]
+        events = []
+        pid = os.getpid()
+        for trace in traces[-limit:]:
+            for span in trace.spans:
+                events.append({
+                    "name": span.name,
+                    "cat": span.name.split(".")[0],
+                    "ph": "X",
+                    "ts": span.start / 1000,
+                    "dur": (span.end - span.start) / 1000,
+                    "pid": pid,
+                    # One row per trace in the viewer
+                    "tid": trace.trace_id,
+                    "args": {**span.attrs, "span_id": span.span_id, "parent_id": span.parent_id},
+                })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+tracer = Tracer(settings.TRACE_SAMPLE_RATE, settings.TRACE_BUFFER_SIZE)
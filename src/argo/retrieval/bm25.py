@@ -0,0 +1,49 @@
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an inverted index.
+
+    The BM25 weight of a (term, document) pair does not depend on the query,
+    so it is computed once at build time. A search only sums the weights of
+    the postings of the query terms.
+    """
+
+    def __init__(self, documents: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.size = len(documents)
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+
+        term_freqs = [Counter(tokenize(document)) for document in documents]
+        doc_lens = [sum(tf.values()) for tf in term_freqs]
+        avg_len = (sum(doc_lens) / self.size) if self.size else 0.0
+
+        doc_freq: Dict[str, int] = defaultdict(int)
+        for tf in term_freqs:
+            for term in tf:
+                doc_freq[term] += 1
+
+        postings = defaultdict(list)
+        for doc_id, tf in enumerate(term_freqs):
+            norm = k1 * (1 - b + b * doc_lens[doc_id] / avg_len) if avg_len else k1
+            for term, freq in tf.items():
+                idf = math.log(1 + (self.size - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                postings[term].append((doc_id, idf * freq * (k1 + 1) / (freq + norm)))
+        self.postings = dict(postings)
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            for doc_id, weight in self.postings.get(term, ()):
+                scores[doc_id] += weight
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
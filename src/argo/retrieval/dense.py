@@ -0,0 +1,83 @@
+import zlib
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, dense search is disabled without it
+    np = None
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class DenseIndex:
+    """
+    Cosine similarity search over a matrix of L2-normalized vectors.
+
+    Queries are scored with a single matrix-vector (or matrix-matrix for a
+    batch) product and the top-k is selected with argpartition.
+    """
+
+    def __init__(self, vectors: Sequence[Sequence[float]]):
+        if np is None:
+            raise RuntimeError("numpy is required for dense retrieval")
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2:
+            raise ValueError("vectors must be a 2-dimensional array")
+        self.matrix = self.normalize(matrix)
+
+    @staticmethod
+    def normalize(matrix):
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def search_batch(self, queries: Sequence[Sequence[float]], k: int) -> List[List[Tuple[int, float]]]:
+        queries = self.normalize(np.asarray(queries, dtype=np.float32))
+        scores = queries @ self.matrix.T
+        k = min(k, len(self))
+        if k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in enumerate(top):
+            ordered = candidates[np.argsort(-scores[row, candidates])]
+            results.append([(int(i), float(scores[row, i])) for i in ordered])
+        return results
+
+    def search(self, query: Sequence[float], k: int) -> List[Tuple[int, float]]:
+        return self.search_batch([query], k)[0]
+
+
+class HashingVectorizer:
+    """
+    TF-IDF vectors over a fixed number of hashed term buckets, so texts can
+    be compared with DenseIndex without an embedding model.
+    """
+
+    def __init__(self, dimensions: int = 1024):
+        if np is None:
+            raise RuntimeError("numpy is required for hashed vectors")
+        self.dimensions = dimensions
+        self.idf = np.ones(dimensions, dtype=np.float32)
+
+    def _counts(self, tokens: Sequence[str]):
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for token in tokens:
+            vector[zlib.crc32(token.encode("utf-8")) % self.dimensions] += 1.0
+        return vector
+
+    def fit_transform(self, documents: Sequence[Sequence[str]]):
+        counts = np.stack([self._counts(tokens) for tokens in documents]) if documents \
+            else np.zeros((0, self.dimensions), dtype=np.float32)
+        doc_freq = (counts > 0).sum(axis=0)
+        self.idf = np.log((1 + len(documents)) / (1 + doc_freq)).astype(np.float32) + 1.0
+        return counts * self.idf
+
+    def transform(self, tokens: Sequence[str]):
+        return self._counts(tokens) * self.idf
@@ -1,30 +1,34 @@
 
-from langchain_openai import ChatOpenAI
-from langchain.prompts import PromptTemplate
-from langchain.prompts.chat import ChatPromptTemplate
-from langchain.chains.summarize import load_summarize_chain
-from langchain_core.documents import Document
 from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
-from typing import Union, List, Tuple, Dict, Any, Literal
+from langchain_core.prompts import PromptTemplate
+from typing import Union, List, Tuple, Dict, Any, Literal, Optional, TYPE_CHECKING
+
+from argo.env_settings import settings
+from argo.utils.llm_clients import llm_clients
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_openai import ChatOpenAI
 
 
 
 async def get_chat_model(
-        model_name,
-        api_key,
-        kwargs
-
-) -> ChatOpenAI:
-    print(**kwargs)
-    return ChatOpenAI(
-        api_key=api_key,
-        model=model_name,
+        model,
+        api_key=None,
+        **kwargs
+) -> "ChatOpenAI":
+    return llm_clients.chat_openai(
+        model=model,
+        api_key=api_key or settings.LLM_KEY or None,
+        base_url=kwargs.pop("base_url", None) or settings.LLM_BASE_URL or None,
         **kwargs
     )
 
 
 async def llm_chat(
-        prompt: Union[str, ChatPromptTemplate],
+        prompt: Union[str, "ChatPromptTemplate"],
         input: Dict[str, Any],
         model='anthropic/claude-3.5-sonnet',
         temperature=0,
@@ -44,7 +48,7 @@ async def llm_chat(
 
 
 async def llm_chat_stream(
-        prompt: Union[str, ChatPromptTemplate],
+        prompt: Union[str, "ChatPromptTemplate"],
         input: Dict[str, Any],
         model='anthropic/claude-3.5-sonnet',
         temperature=0,
@@ -62,11 +66,17 @@ async def llm_chat_stream(
 
 
 async def summarize(
-        docs: List[Document],
+        docs: List["Document"],
         model='anthropic/claude-3.5-sonnet',
         temperature=0,
+        chat_model: Optional["BaseChatModel"] = None,
 ):
-    chat_model = await get_chat_model(model=model, temperature=temperature)
+    # langchain.chains pulls in most of langchain, only import it once a
+    # conversation is actually compacted
+    from langchain.chains.summarize import load_summarize_chain
+
+    if chat_model is None:
+        chat_model = await get_chat_model(model=model, temperature=temperature)
 
     chain = load_summarize_chain(chat_model, chain_type="stuff")
     result = await chain.ainvoke(docs, return_only_outputs=True)
@@ -75,7 +85,7 @@ async def summarize(
 
 
 async def llm_analyze(
-        prompt: Union[str, ChatPromptTemplate],
+        prompt: Union[str, "ChatPromptTemplate"],
         input: Dict[str, Any],
         output_type: Literal['json', 'text'] = 'json',
         model='anthropic/claude-3.5-sonnet',
@@ -0,0 +1,86 @@
+import importlib.util
+import json
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+
+import httpx
+
+from argo.configs import logger
+from argo.env_settings import settings
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+
+class LLMClientRegistry:
+    """
+    Process-wide registry of LLM clients.
+
+    One pair of pooled keep-alive httpx clients is kept per base_url, and
+    ChatOpenAI instances are shared by every caller asking for the same
+    (base_url, api_key, model params), so hundreds of characters pointing
+    at one provider reuse the same connections.
+    """
+
+    def __init__(self):
+        self._http_clients: Dict[str, Tuple[httpx.Client, httpx.AsyncClient]] = {}
+        self._chat_models: Dict[Tuple[Optional[str], Optional[str], str, str], "ChatOpenAI"] = {}
+
+    @staticmethod
+    def http2_enabled() -> bool:
+        return settings.LLM_HTTP2 and importlib.util.find_spec("h2") is not None
+
+    def http_clients(self, base_url: Optional[str]) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        key = base_url or ""
+        clients = self._http_clients.get(key)
+        if clients is None:
+            limits = httpx.Limits(
+                max_connections=settings.LLM_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=settings.LLM_POOL_KEEPALIVE_EXPIRY,
+            )
+            http2 = self.http2_enabled()
+            clients = (
+                httpx.Client(limits=limits, http2=http2),
+                httpx.AsyncClient(limits=limits, http2=http2),
+            )
+            self._http_clients[key] = clients
+            logger.info(f"Created LLM connection pool for {key or 'default'} (http2={http2})")
+        return clients
+
+    def chat_openai(
+            self,
+            model: str,
+            api_key: Optional[str] = None,
+            base_url: Optional[str] = None,
+            **params: Any
+    ) -> "ChatOpenAI":
+        # Params may hold dicts or lists (default_headers, model_kwargs)
+        key = (base_url, api_key, model, json.dumps(params, sort_keys=True, default=repr))
+        chat_model = self._chat_models.get(key)
+        if chat_model is None:
+            # langchain_openai pulls in the openai SDK, import it on first use
+            from langchain_openai import ChatOpenAI
+
+            http_client, http_async_client = self.http_clients(base_url)
+            kwargs = dict(params)
+            if base_url:
+                kwargs["base_url"] = base_url
+            chat_model = ChatOpenAI(
+                model=model,
+                api_key=api_key,
+                http_client=http_client,
+                http_async_client=http_async_client,
+                **kwargs
+            )
+            self._chat_models[key] = chat_model
+        return chat_model
+
+    async def aclose(self):
+        for http_client, http_async_client in self._http_clients.values():
+            http_client.close()
+            await http_async_client.aclose()
+        self._http_clients.clear()
+        self._chat_models.clear()
+
+
+llm_clients = LLMClientRegistry()
@@ -0,0 +1,143 @@
+import asyncio
+import random
+import time
+import zlib
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from argo.env_settings import settings
+
+WORDS = (
+    "the", "people", "great", "deal", "very", "believe", "me", "we", "will", "make",
+    "it", "happen", "tremendous", "country", "really", "going", "to", "be", "win", "so",
+    "much", "nobody", "knows", "better", "than", "I", "do", "and", "they", "said",
+)
+
+
+class MockLLMError(Exception):
+    def __init__(self, message: str, status_code: int = 500):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class MockChatModel(BaseChatModel):
+    """
+    In-process chat model for load tests and benchmarks.
+
+    Responses are pseudo-random words drawn from a generator seeded with
+    ``seed`` and the prompt, so the same prompt always gets the same answer,
+    length and failure regardless of concurrency. Latency follows the
+    configured time-to-first-token and token rate.
+
+    A failing prompt fails on every attempt, so failures are raised with
+    ``error_status`` 400 by default, which the provider lane does not retry.
+    Set it to 429 or a 5xx status to exercise the retry path.
+    """
+
+    model_name: str = "mock"
+    ttft: float = 0.2
+    tokens_per_second: float = 50.0
+    error_rate: float = 0.0
+    error_status: int = 400
+    mean_tokens: int = 100
+    tokens_stddev: float = 30.0
+    max_tokens: Optional[int] = None
+    seed: int = 0
+
+    @classmethod
+    def from_settings(cls, model_name: Optional[str] = None, max_tokens: Optional[int] = None) -> "MockChatModel":
+        return cls(
+            model_name=model_name or "mock",
+            ttft=settings.MOCK_LLM_TTFT,
+            tokens_per_second=settings.MOCK_LLM_TOKENS_PER_SECOND,
+            error_rate=settings.MOCK_LLM_ERROR_RATE,
+            error_status=settings.MOCK_LLM_ERROR_STATUS,
+            mean_tokens=settings.MOCK_LLM_MEAN_TOKENS,
+            tokens_stddev=settings.MOCK_LLM_TOKENS_STDDEV,
+            max_tokens=max_tokens,
+            seed=settings.MOCK_LLM_SEED,
+        )
+
+    @property
+    def _llm_type(self) -> str:
+        return "mock"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model_name": self.model_name, "seed": self.seed}
+
+    def _plan(self, messages: List[BaseMessage]) -> List[str]:
+        prompt = "\n".join(str(message.content) for message in messages)
+        rng = random.Random(zlib.crc32(prompt.encode("utf-8")) ^ self.seed)
+        if rng.random() < self.error_rate:
+            raise MockLLMError("Mock provider error", self.error_status)
+        length = max(1, round(rng.gauss(self.mean_tokens, self.tokens_stddev)))
+        if self.max_tokens:
+            length = min(length, self.max_tokens)
+        return [rng.choice(WORDS) if i == 0 else " " + rng.choice(WORDS) for i in range(length)]
+
+    def _schedule(self, start: float, index: int) -> float:
+        # Absolute deadlines, so sleep overshoot does not accumulate
+        if self.tokens_per_second <= 0:
+            return start + self.ttft
+        return start + self.ttft + index / self.tokens_per_second
+
+    def _stream(
+            self,
+            messages: List[BaseMessage],
+            stop: Optional[List[str]] = None,
+            run_manager: Optional[CallbackManagerForLLMRun] = None,
+            **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        start = time.monotonic()
+        tokens = self._plan(messages)
+        for i, token in enumerate(tokens):
+            delay = self._schedule(start, i) - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+            self,
+            messages: List[BaseMessage],
+            stop: Optional[List[str]] = None,
+            run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+            **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        start = time.monotonic()
+        tokens = self._plan(messages)
+        for i, token in enumerate(tokens):
+            delay = self._schedule(start, i) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    def _generate(
+            self,
+            messages: List[BaseMessage],
+            stop: Optional[List[str]] = None,
+            run_manager: Optional[CallbackManagerForLLMRun] = None,
+            **kwargs: Any
+    ) -> ChatResult:
+        content = "".join(chunk.message.content for chunk in self._stream(messages, stop, run_manager))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    async def _agenerate(
+            self,
+            messages: List[BaseMessage],
+            stop: Optional[List[str]] = None,
+            run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+            **kwargs: Any
+    ) -> ChatResult:
+        chunks = [chunk.message.content async for chunk in self._astream(messages, stop, run_manager)]
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(chunks)))])
@@ -0,0 +1,125 @@
+"""
+Startup profile of an argo worker.
+
+Reports where import time goes, by module and by top-level package, using
+``python -X importtime`` in a fresh interpreter so nothing is cached:
+
+    python -m argo.utils.startup_profile
+    python -m argo.utils.startup_profile --max-import-seconds 0     # no import budget
+    python -m argo.utils.startup_profile --startup                  # also time RuntimeState.startup
+
+It exits with status 1 when importing exceeds IMPORT_BUDGET_SECONDS or
+pulls in one of DEFERRED_IMPORTS, the same checks tests/test_startup.py runs
+(the timing one only with ARGO_IMPORT_BUDGET_TEST=1).
+
+``--startup`` runs the real startup phases, so Redis and MongoDB must be
+reachable.
+"""
+import argparse
+import asyncio
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# Cold import of argo.main, with headroom for slower CI machines
+IMPORT_BUDGET_SECONDS = 1.5
+# Heavy modules only needed by some requests, imported where they are used
+DEFERRED_IMPORTS = ("langchain.chains", "langchain_openai", "openai", "motor", "beanie", "jsonschema", "passlib")
+
+
+def profile_imports(module: str) -> List[Tuple[str, int, int, int]]:
+    """
+    (module, self us, cumulative us, nesting level) of every import done
+    by ``import module`` in a new interpreter.
+    """
+    # Resolve modules the way this interpreter does, e.g. from a src checkout
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(path for path in sys.path if path)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def import_seconds(entries: List[Tuple[str, int, int, int]]) -> float:
+    return sum(self_us for _, self_us, _, _ in entries) / 1e6
+
+
+def eager_deferred_imports(entries: List[Tuple[str, int, int, int]]) -> List[str]:
+    names = {name for name, _, _, _ in entries}
+    return [module for module in DEFERRED_IMPORTS if module in names]
+
+
+def by_package(entries: List[Tuple[str, int, int, int]]) -> Dict[str, int]:
+    totals: Dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in entries:
+        totals[name.split(".")[0]] += self_us
+    return totals
+
+
+async def profile_startup() -> Dict[str, float]:
+    from fastapi import FastAPI
+    from argo.kernel.runtime_state import runtime
+
+    try:
+        await runtime.startup(FastAPI())
+        return dict(runtime.startup_phases)
+    finally:
+        await runtime.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="argo.main")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--max-import-seconds", type=float, default=IMPORT_BUDGET_SECONDS,
+                        help="exit with status 1 if importing takes longer, 0 disables the check")
+    parser.add_argument("--startup", action="store_true", help="also run and time RuntimeState.startup")
+    args = parser.parse_args()
+
+    entries = profile_imports(args.module)
+    total = import_seconds(entries)
+
+    print(f"import {args.module}: {total:.3f}s, {len(entries)} modules\n")
+    print("Slowest imports (cumulative):")
+    for name, _, cumulative_us, level in sorted(entries, key=lambda e: -e[2])[:args.top]:
+        print(f"  {cumulative_us / 1e3:9.1f} ms  {'  ' * level}{name}")
+    print("\nBy package (self time):")
+    for package, self_us in sorted(by_package(entries).items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {self_us / 1e3:9.1f} ms  {package}")
+
+    if args.startup:
+        phases = asyncio.run(profile_startup())
+        print("\nRuntimeState.startup:")
+        for name, seconds in phases.items():
+            print(f"  {seconds * 1e3:9.1f} ms  {name}")
+
+    failed = False
+    if args.max_import_seconds and total > args.max_import_seconds:
+        print(f"\nimport time {total:.3f}s exceeds the {args.max_import_seconds:.3f}s budget", file=sys.stderr)
+        failed = True
+    eager = eager_deferred_imports(entries)
+    if eager:
+        print(f"\nimported at startup, should be deferred: {', '.join(eager)}", file=sys.stderr)
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Optional
+
+from argo.kernel.schema import WebSocketMessage, MessageType
+
+_PLACEHOLDER = "\x00content\x00"
+
+
+def _dumps(value) -> str:
+    # Same encoding as starlette's WebSocket.send_json
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+class StreamFrameEncoder:
+    """
+    Serializes stream frames of one response from a template rendered once,
+    so a frame costs one json string escape instead of a pydantic model,
+    model_dump and a full json.dumps.
+    """
+
+    def __init__(self, agent_id: Optional[str], message_type: MessageType = MessageType.CHAT_STREAM):
+        template = _dumps(WebSocketMessage(
+            type=message_type,
+            content=_PLACEHOLDER,
+            agent_id=agent_id,
+            is_final=False
+        ).model_dump(mode="json"))
+        self.prefix, self.suffix = template.split(_dumps(_PLACEHOLDER))
+        self.final_frame = _dumps(WebSocketMessage(
+            type=message_type,
+            content="",
+            agent_id=agent_id,
+            is_final=True
+        ).model_dump(mode="json"))
+
+    def frame(self, content: str) -> str:
+        return self.prefix + _dumps(content) + self.suffix
+
+
+async def _aclose(iterator):
+    aclose = getattr(iterator, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
+_END = object()
+
+
+async def coalesce_chunks(
+        chunks: AsyncIterator[str],
+        max_bytes: int,
+        max_delay: float
+) -> AsyncIterator[str]:
+    """
+    Merge stream chunks until ``max_bytes`` are buffered or ``max_delay``
+    seconds have passed since the first buffered chunk, whichever is first.
+
+    The source is read by a single pump task feeding a queue, so the whole
+    source generator runs in one task and context, and closing the
+    coalesced stream cancels and closes the source.
+    """
+    if max_bytes <= 1 and max_delay <= 0:
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await _aclose(chunks)
+        return
+
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump():
+        try:
+            async for chunk in chunks:
+                queue.put_nowait(chunk)
+        except Exception as e:
+            queue.put_nowait(e)
+        finally:
+            queue.put_nowait(_END)
+            await _aclose(chunks)
+
+    task = asyncio.create_task(pump())
+    buffer = []
+    size = 0
+    deadline = 0.0
+    try:
+        while True:
+            timeout = max(deadline - time.monotonic(), 0) if buffer else None
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                yield "".join(buffer)
+                buffer, size = [], 0
+                continue
+
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                if buffer:
+                    yield "".join(buffer)
+                raise item
+            if not item:
+                continue
+            if not buffer:
+                deadline = time.monotonic() + max_delay
+            buffer.append(item)
+            size += len(item.encode("utf-8"))
+            if size >= max_bytes:
+                yield "".join(buffer)
+                buffer, size = [], 0
+
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        task.cancel()
+        await asyncio.wait({task})
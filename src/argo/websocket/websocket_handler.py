@@ -3,10 +3,36 @@
 from fastapi import FastAPI, Path, Query
 from starlette.websockets import WebSocket, WebSocketDisconnect
 import json
+from typing import AsyncIterator
 
 from argo.kernel.schema import WebSocketMessage, MessageType
 from argo.command.commands import CommandContext
-from argo.configs import logger
+from argo.configs import logger, sampled_logger
+from argo.env_settings import settings
+from argo.websocket.stream_encoder import StreamFrameEncoder, coalesce_chunks
+from argo.websocket.websocket_manager import WS_MESSAGES
+from argo.metrics.tracing import tracer
+
+async def stream_chat(ws_manager, uid: str, agent_id: str, chunks: AsyncIterator[str]) -> bool:
+    """
+    Send a streamed reply as coalesced frames followed by the final frame.
+    Stops as soon as a send fails, closing ``chunks`` so the LLM stream
+    behind it is cancelled. Returns whether the whole reply was sent.
+    """
+    encoder = StreamFrameEncoder(agent_id)
+    frames = coalesce_chunks(
+        chunks,
+        settings.WS_STREAM_FLUSH_BYTES,
+        settings.WS_STREAM_FLUSH_INTERVAL_MS / 1000
+    )
+    try:
+        async for text in frames:
+            if not await ws_manager.send_to_user(uid, encoder.frame(text)):
+                return False
+        return await ws_manager.send_to_user(uid, encoder.final_frame)
+    finally:
+        await frames.aclose()
+
 
 def setup_websocket(app: FastAPI, runtime_state):
     @app.websocket("/ws/{uid}")
@@ -37,94 +63,78 @@ def setup_websocket(app: FastAPI, runtime_state):
             while True:
                 try:
                     data = await websocket.receive_text()
+                    WS_MESSAGES.inc("in")
                     data = data.strip()
 
-                    try:
-                        message = WebSocketMessage.model_validate_json(data)
-                        if message.type == MessageType.COMMAND:
-                            parts = message.content.split()
-                            if parts:
-                                command = parts[0]
-                                args = parts[1:]
-                                await runtime_state.command_manager.execute(command, args, context)
-
-                        elif message.type == MessageType.CHAT:
-                            async def handle_chat_message(message: WebSocketMessage):
-                                if message.agent_id:
-                                    agent = await runtime_state.character_manager.get_agent(message.agent_id)
-                                    if agent:
-                                        try:
-                                            if message.stream:
-                                                async for chunk in  agent.achat(message.content, context):
-                                                    stream_msg = WebSocketMessage(
-                                                        type=MessageType.CHAT_STREAM,
-                                                        content=chunk,
-                                                        agent_id=message.agent_id,
-                                                        is_final=False
+                    with tracer.span("ws.message", uid=uid):
+                        try:
+                            message = WebSocketMessage.model_validate_json(data)
+                            if message.type == MessageType.COMMAND:
+                                parts = message.content.split()
+                                if parts:
+                                    command = parts[0]
+                                    args = parts[1:]
+                                    await runtime_state.command_manager.execute(command, args, context)
+
+                            elif message.type == MessageType.CHAT:
+                                async def handle_chat_message(message: WebSocketMessage):
+                                    if message.agent_id:
+                                        agent = await runtime_state.character_manager.get_agent(message.agent_id)
+                                        if agent:
+                                            try:
+                                                if message.stream:
+                                                    await stream_chat(
+                                                        runtime_state.ws_manager,
+                                                        uid,
+                                                        message.agent_id,
+                                                        agent.achat(message.content, context)
+                                                    )
+                                                else:
+                                                    response = await agent.chat(message.content, context)
+                                                    response_msg = WebSocketMessage(
+                                                        type=MessageType.CHAT,
+                                                        content=response,
+                                                        agent_id=message.agent_id
                                                     )
                                                     await runtime_state.ws_manager.send_to_user(
                                                         uid,
-                                                        stream_msg.model_dump()
+                                                        response_msg.model_dump()
                                                     )
-
-
-
-                                                final_msg = WebSocketMessage(
-                                                    type=MessageType.CHAT_STREAM,
-                                                    content="",
-                                                    agent_id=message.agent_id,
-                                                    is_final=True
-                                                )
-                                                await runtime_state.ws_manager.send_to_user(
-                                                    uid,
-                                                    final_msg.model_dump()
-                                                )
-                                            else:
-                                                response = await agent.chat(message.content, context)
-                                                response_msg = WebSocketMessage(
-                                                    type=MessageType.CHAT,
-                                                    content=response,
-                                                    agent_id=message.agent_id
-                                                )
-                                                await runtime_state.ws_manager.send_to_user(
-                                                    uid,
-                                                    response_msg.model_dump()
+                                            except Exception as e:
+                                                error_msg = WebSocketMessage(
+                                                    type=MessageType.SYSTEM,
+                                                    content=f"Error processing chat: {str(e)}"
                                                 )
-                                        except Exception as e:
+                                                await websocket.send_json(error_msg.model_dump())
+                                                sampled_logger.error("ws.chat", "Error processing chat for %s: %s", uid, e)
+                                        else:
                                             error_msg = WebSocketMessage(
-                                                type=MessageType.SYSTEM,
-                                                content=f"Error processing chat: {str(e)}"
+                                                type=MessageType.CHAT,
+                                                content=f"Agent {message.agent_id} not found"
                                             )
+                                            logger.error(f"Agent not found for {uid}")
                                             await websocket.send_json(error_msg.model_dump())
-                                            logger.error(f"Error processing chat for {uid}: {e}")
-                                    else:
-                                        error_msg = WebSocketMessage(
-                                            type=MessageType.CHAT,
-                                            content=f"Agent {message.agent_id} not found"
-                                        )
-                                        logger.error(f"Agent not found for {uid}")
-                                        await websocket.send_json(error_msg.model_dump())
-                            await handle_chat_message(message)
-                        else:
-                            error_msg = WebSocketMessage(
-                                type=MessageType.SYSTEM,
-                                content="Please specify an agent_id for chat"
-                            )
-                            await websocket.send_json(error_msg.dict())
-
-                    except ValueError:
-                        if data.startswith('/'):
-                            parts = data[1:].split()
-                            if parts:
-                                command = parts[0]
-                                args = parts[1:]
-                                await runtime_state.command_manager.execute(command, args, context)
-                        else:
-                            error_msg = WebSocketMessage(
-                                type=MessageType.SYSTEM,
-                                content="Invalid message format. Use JSON format or /command args"
-                            )
-                            await websocket.send_json(error_msg.model_dump())
+                                await handle_chat_message(message)
+                            else:
+                                error_msg = WebSocketMessage(
+                                    type=MessageType.SYSTEM,
+                                    content="Please specify an agent_id for chat"
+                                )
+                                await websocket.send_json(error_msg.dict())
+
+                        except ValueError:
+                            if data.startswith('/'):
+                                parts = data[1:].split()
+                                if parts:
+                                    command = parts[0]
+                                    args = parts[1:]
+                                    await runtime_state.command_manager.execute(command, args, context)
+                            else:
+                                error_msg = WebSocketMessage(
+                                    type=MessageType.SYSTEM,
+                                    content="Invalid message format. Use JSON format or /command args"
+                                )
+                                await websocket.send_json(error_msg.model_dump())
 
                 except json.JSONDecodeError:
                     error_msg = WebSocketMessage(
@@ -140,7 +150,7 @@ def setup_websocket(app: FastAPI, runtime_state):
                 content=f"User {uid} disconnected"
             )
             await runtime_state.ws_manager.broadcast(disconnect_msg.model_dump())
-            logger.info(f"websocket disconnected for {uid}")
+            sampled_logger.info("ws.disconnect", "websocket disconnected for %s", uid)
         except Exception as e:
             logger.error(f"WebSocket error for user {uid}: {e}")
             error_msg = WebSocketMessage(
@@ -150,5 +160,5 @@ def setup_websocket(app: FastAPI, runtime_state):
             await websocket.send_json(error_msg.model_dump())
         finally:
             runtime_state.ws_manager.disconnect(uid)
-            logger.info(f"finally websocket disconnected for {uid}")
+            sampled_logger.debug("ws.disconnect", "finally websocket disconnected for %s", uid)
 
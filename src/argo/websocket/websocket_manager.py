@@ -1,7 +1,12 @@
 from typing import Dict, List
 from fastapi import WebSocket
 
-from argo.configs import logger
+from argo.configs import sampled_logger
+from argo.metrics.registry import metrics
+
+WS_CONNECTIONS = metrics.counter("argo_ws_connections_total", "Accepted WebSocket connections")
+WS_MESSAGES = metrics.counter("argo_ws_messages_total", "WebSocket messages by direction", ["direction"])
+WS_SEND_ERRORS = metrics.counter("argo_ws_send_errors_total", "Failed WebSocket sends")
 
 
 class WebSocketManager:
@@ -11,8 +16,9 @@ class WebSocketManager:
     async def connect(self, uid: str, websocket: WebSocket):
         await websocket.accept()
         self.active_connections[uid] = websocket
+        WS_CONNECTIONS.inc()
         await self.broadcast(f"User {uid} connected")
-        logger.info(f"Accepted new connection:{websocket.client.host}:{websocket.client.port}")
+        sampled_logger.info("ws.connect", "Accepted new connection:%s:%s", websocket.client.host, websocket.client.port)
 
     def disconnect(self, uid: str):
         if uid in self.active_connections:
@@ -23,8 +29,10 @@ class WebSocketManager:
         for uid, connection in self.active_connections.items():
             try:
                 await connection.send_text(message)
+                WS_MESSAGES.inc("out")
             except RuntimeError as e:
-                logger.error(f"Failed to broadcast message to {uid}: {e}")
+                WS_SEND_ERRORS.inc()
+                sampled_logger.error("ws.broadcast", "Failed to broadcast message to %s: %s", uid, e)
                 disconnected_uids.append(uid)
 
         for uid in disconnected_uids:
@@ -37,16 +45,19 @@ class WebSocketManager:
                     await self.active_connections[uid].send_text(message)
                 elif isinstance(message, dict):
                     await self.active_connections[uid].send_json(message)
+                WS_MESSAGES.inc("out")
                 return True
             except RuntimeError as e:
-                logger.error(f"Failed sending message to user{uid}: {e}")
+                WS_SEND_ERRORS.inc()
+                sampled_logger.error("ws.send", "Failed sending message to user %s: %s", uid, e)
                 self.disconnect(uid)
             except Exception as e:
-                logger.error(f"Error sending message to user {uid}: {e}")
+                WS_SEND_ERRORS.inc()
+                sampled_logger.error("ws.send", "Error sending message to user %s: %s", uid, e)
                 self.disconnect(uid)
                 return False
         else:
-            logger.error(f"No active connection for {uid}")
+            sampled_logger.error("ws.send", "No active connection for %s", uid)
         return False
 
 
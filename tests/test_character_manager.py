@@ -0,0 +1,60 @@
+import asyncio
+import json
+import shutil
+from pathlib import Path
+
+from argo.character.character_manager import CharacterManager
+
+MOCK_CHARACTER = Path(__file__).parent.parent / "characters" / "mock.character.json"
+
+
+def test_reload_swaps_changed_files_only(tmp_path):
+    path = tmp_path / "mock.character.json"
+    shutil.copy(MOCK_CHARACTER, path)
+    manager = CharacterManager()
+
+    async def run():
+        success, _, message = await manager.reload_character(str(path))
+        assert (success, message) == (True, "loaded")
+        old_agent = await manager.get_agent("mock")
+
+        success, _, message = await manager.reload_character(str(path))
+        assert (success, message) == (True, "unchanged")
+        assert await manager.get_agent("mock") is old_agent
+
+        data = json.loads(path.read_text())
+        data["bio"] = ["reloaded"]
+        path.write_text(json.dumps(data))
+        success, character, message = await manager.reload_character(str(path))
+        assert (success, message) == (True, "reloaded")
+        assert character.bio == ["reloaded"]
+        assert await manager.get_agent("mock") is not old_agent
+
+    asyncio.run(run())
+
+
+def test_reload_keeps_the_old_version_of_an_invalid_file(tmp_path):
+    path = tmp_path / "mock.character.json"
+    shutil.copy(MOCK_CHARACTER, path)
+    manager = CharacterManager()
+
+    async def run():
+        await manager.reload_character(str(path))
+        path.write_text("{")
+        success, _, _ = await manager.reload_character(str(path))
+        assert not success
+        assert (await manager.get_character("mock")).name == "mock"
+
+    asyncio.run(run())
+
+
+def test_find_source_accepts_allowed_paths_and_loaded_names(tmp_path):
+    path = tmp_path / "mock.character.json"
+    shutil.copy(MOCK_CHARACTER, path)
+    manager = CharacterManager()
+    asyncio.run(manager.reload_character(str(path)))
+
+    assert manager.find_source(str(path), [str(path)]) == str(path)
+    assert manager.find_source("mock", []) == str(path)
+    assert manager.find_source(str(path), []) is None
+    assert manager.find_source("/etc/passwd", [str(path)]) is None
@@ -0,0 +1,93 @@
+import asyncio
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from argo.character.character_manager import CharacterManager
+from argo.env_settings import settings
+from argo.kernel import character_agent
+from argo.metrics.chat_metrics import ChatMetrics, current_chat_timer
+
+MOCK_CHARACTER = Path(__file__).parent.parent / "characters" / "mock.character.json"
+
+
+def test_finish_records_a_successful_request():
+    stats_source = ChatMetrics()
+    timer = stats_source.timer("agent", "model", prompt_tokens=10)
+    timer.queued(0.01)
+    timer.token()
+    timer.token()
+    timer.finish(20)
+
+    stats = dict(stats_source.items())[("agent", "model")]
+    assert stats.requests == 1
+    assert stats.errors == {}
+    assert stats.inter_token.count == 1
+    assert stats.completion_tokens.count == 1
+    assert stats.queue_time.count == 1
+
+
+def test_finish_counts_errors_by_class():
+    stats_source = ChatMetrics()
+    stats_source.timer("agent", None).finish(0, asyncio.CancelledError())
+
+    stats = dict(stats_source.items())[("agent", "default")]
+    assert stats.errors == {"CancelledError": 1}
+    assert stats.duration.count == 0
+
+
+def test_finish_restores_the_current_timer():
+    stats_source = ChatMetrics()
+    outer = stats_source.timer("agent", "model")
+    inner = stats_source.timer("agent", "model")
+    assert current_chat_timer.get() is inner
+    inner.finish(1)
+    assert current_chat_timer.get() is outer
+    outer.finish(1)
+    assert current_chat_timer.get() is None
+
+
+@pytest.fixture
+def mock_agent(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MOCK_LLM_TTFT", 0.0)
+    monkeypatch.setattr(settings, "MOCK_LLM_TOKENS_PER_SECOND", 1000.0)
+    monkeypatch.setattr(character_agent, "chat_metrics", ChatMetrics())
+    path = tmp_path / "mock.character.json"
+    shutil.copy(MOCK_CHARACTER, path)
+    manager = CharacterManager()
+
+    async def load():
+        await manager.reload_character(str(path))
+        return await manager.get_agent("mock")
+
+    return asyncio.run(load())
+
+
+def agent_stats(agent):
+    (stats,) = [stats for _, stats in character_agent.chat_metrics.items()]
+    return stats
+
+
+def test_closed_stream_is_recorded_as_an_error(mock_agent):
+    async def run():
+        stream = mock_agent.achat("hello", SimpleNamespace(uid="user"))
+        async for _ in stream:
+            break
+        await stream.aclose()
+        assert current_chat_timer.get() is None
+
+    asyncio.run(run())
+    assert agent_stats(mock_agent).errors == {"GeneratorExit": 1}
+
+
+def test_completed_stream_is_recorded(mock_agent):
+    async def run():
+        chunks = [chunk async for chunk in mock_agent.achat("hello", SimpleNamespace(uid="user"))]
+        assert current_chat_timer.get() is None
+        return chunks
+
+    assert asyncio.run(run())
+    stats = agent_stats(mock_agent)
+    assert (stats.requests, stats.errors) == (1, {})
@@ -0,0 +1,57 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from argo.character.schema import CompactionSettings
+from argo.kernel.compaction import ConversationCompactor
+from argo.kernel.llm_scheduler import ProviderLane
+from argo.kernel.session import SessionMessage, SessionStore
+from argo.utils.mock_llm import MockChatModel
+
+
+@pytest.mark.parametrize("values", [
+    {"threshold": 20, "max_messages": 20},
+    {"threshold": 6, "keep_last": 6},
+])
+def test_settings_that_never_compact_are_rejected(values):
+    with pytest.raises(ValidationError):
+        CompactionSettings(enabled=True, **values)
+
+
+def test_old_turns_are_folded_into_a_summary():
+    compaction = CompactionSettings(enabled=True, threshold=6, keep_last=2, max_messages=12)
+    store = SessionStore()
+    chat_handler = SimpleNamespace(
+        chat_model=MockChatModel(ttft=0.0, tokens_per_second=0.0, mean_tokens=8, tokens_stddev=0),
+        lane=ProviderLane("mock", max_concurrency=4, rpm=0, tpm=0),
+    )
+    compactor = ConversationCompactor(chat_handler, compaction, store)
+
+    async def run():
+        session = await store.get_session("user", "agent", compaction.max_messages)
+        for turn in range(3):
+            await store.append(
+                session,
+                SessionMessage.from_role("user", f"question {turn}"),
+                SessionMessage.from_role("assistant", f"answer {turn}"),
+            )
+            assert compactor.maybe_compact(session) is None
+
+        await store.append(
+            session,
+            SessionMessage.from_role("user", "question 3"),
+            SessionMessage.from_role("assistant", "answer 3"),
+        )
+        task = compactor.maybe_compact(session)
+        assert task is not None
+        await task
+        return session
+
+    session = asyncio.run(run())
+    assert [message.content for message in session.history()] == ["question 3", "answer 3"]
+    assert session.total_tokens == sum(message.tokens for message in session.history())
+    assert session.summary.content.startswith("Summary of the earlier conversation:\n")
+    assert len(session.summary.content) > len("Summary of the earlier conversation:\n")
+    assert not session.compacting
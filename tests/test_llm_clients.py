@@ -0,0 +1,15 @@
+from argo.utils.llm_clients import LLMClientRegistry
+
+
+def test_chat_models_are_shared_by_equal_params():
+    registry = LLMClientRegistry()
+    first = registry.chat_openai("gpt-4o-mini", api_key="key", base_url="http://localhost:1/v1",
+                                 default_headers={"a": "b"}, model_kwargs={"stop": ["x"]})
+    same = registry.chat_openai("gpt-4o-mini", api_key="key", base_url="http://localhost:1/v1",
+                                model_kwargs={"stop": ["x"]}, default_headers={"a": "b"})
+    other = registry.chat_openai("gpt-4o-mini", api_key="key", base_url="http://localhost:1/v1",
+                                 default_headers={"a": "c"}, model_kwargs={"stop": ["x"]})
+    assert first is same
+    assert first is not other
+    # One connection pool per base_url
+    assert first.http_async_client is other.http_async_client
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from argo.kernel.llm_router import ChatRoute, HedgedRouter, LatencyTracker
+from argo.kernel.llm_scheduler import Priority, ProviderLane
+from argo.utils.mock_llm import MockChatModel, MockLLMError
+
+MESSAGES = [HumanMessage(content="hello")]
+
+
+def make_route(name: str, ttft: float, error_rate: float = 0.0) -> ChatRoute:
+    model = MockChatModel(model_name=name, ttft=ttft, tokens_per_second=1000, error_rate=error_rate,
+                          mean_tokens=5, tokens_stddev=0)
+    return ChatRoute(name, model, ProviderLane(name, max_concurrency=4, rpm=0, tpm=0))
+
+
+async def invoke(router: HedgedRouter) -> str:
+    return await router.ainvoke(MESSAGES, Priority.INTERACTIVE, 0)
+
+
+async def stream(router: HedgedRouter) -> str:
+    return "".join([chunk async for chunk in router.astream(MESSAGES, Priority.INTERACTIVE, 0)])
+
+
+@pytest.mark.parametrize("call", [invoke, stream])
+def test_slow_primary_is_hedged_to_fallback(call):
+    primary, fallback = make_route("primary", ttft=1.0), make_route("fallback", ttft=0.01)
+    router = HedgedRouter([primary, fallback], hedge_initial_delay=0.05)
+
+    assert asyncio.run(asyncio.wait_for(call(router), 0.5))
+    assert router.hedges == 1
+    assert (primary.wins, fallback.wins) == (0, 1)
+    # The losing attempt is cancelled and gives its slot back
+    assert primary.lane.active == 0
+    assert fallback.lane.active == 0
+
+
+@pytest.mark.parametrize("call", [invoke, stream])
+def test_failed_primary_fails_over(call):
+    primary, fallback = make_route("primary", ttft=0.01, error_rate=1.0), make_route("fallback", ttft=0.01)
+    router = HedgedRouter([primary, fallback], hedge_initial_delay=10.0)
+
+    assert asyncio.run(call(router))
+    assert router.hedges == 0
+    assert primary.failures == 1
+    assert fallback.wins == 1
+
+
+def test_all_routes_failing_raises_last_error():
+    routes = [make_route("a", ttft=0.01, error_rate=1.0), make_route("b", ttft=0.01, error_rate=1.0)]
+    router = HedgedRouter(routes, hedge_initial_delay=10.0)
+
+    with pytest.raises(MockLLMError):
+        asyncio.run(invoke(router))
+
+
+def test_stream_first_token_timeout_fails_over():
+    primary, fallback = make_route("primary", ttft=1.0), make_route("fallback", ttft=0.01)
+    router = HedgedRouter([primary, fallback], hedge=False, first_token_timeout=0.05)
+
+    assert asyncio.run(asyncio.wait_for(stream(router), 0.5))
+    assert primary.failures == 1
+    assert fallback.wins == 1
+    assert primary.lane.active == 0
+
+
+def test_race_discards_attempts_finishing_during_discard():
+    # a and b finish together, c finishes while b's result is being
+    # discarded; cancel() can't stop c any more, so its result must be
+    # discarded too (for streams it holds a lane slot)
+    routes = [make_route(name, ttft=0.0) for name in ("a", "b", "c")]
+    router = HedgedRouter(routes, hedge_initial_delay=0.0)
+    finish = {"a": 0.01, "b": 0.01, "c": 0.03}
+    discarded = []
+
+    async def attempt(route: ChatRoute) -> str:
+        await asyncio.sleep(finish[route.name])
+        return route.name
+
+    async def discard(result: str):
+        await asyncio.sleep(0.05)
+        discarded.append(result)
+
+    winner = asyncio.run(router._race(attempt, discard, lambda route: route.response))
+    assert winner in ("a", "b")
+    assert sorted(discarded + [winner]) == ["a", "b", "c"]
+
+
+def test_invoke_and_stream_latency_are_tracked_separately():
+    route = make_route("primary", ttft=0.01)
+    router = HedgedRouter([route])
+
+    asyncio.run(invoke(router))
+    assert len(route.response.samples) == 1
+    assert len(route.first_token.samples) == 0
+
+    asyncio.run(stream(router))
+    assert len(route.first_token.samples) == 1
+
+
+def test_hedge_delay_before_and_after_warmup():
+    router = HedgedRouter([make_route("primary", ttft=0.01)], hedge_min_delay=0.5, hedge_initial_delay=2.0)
+    tracker = LatencyTracker(min_samples=3)
+    assert router.hedge_delay(tracker) == 2.0
+
+    for seconds in (0.1, 0.2, 3.0):
+        tracker.record(seconds)
+    assert router.hedge_delay(tracker) == 3.0
+    assert HedgedRouter([], hedge_min_delay=0.5).hedge_delay(LatencyTracker()) == 0.5
+
+
+@pytest.mark.parametrize("status, retried", [(400, 0), (503, 2)])
+def test_mock_errors_are_retried_only_with_a_retryable_status(status, retried):
+    route = make_route("primary", ttft=0.0, error_rate=1.0)
+    route.chat_model.error_status = status
+    route.lane.backoff = 0.01
+
+    with pytest.raises(MockLLMError):
+        asyncio.run(route.lane.call(lambda: route.chat_model.ainvoke(MESSAGES), retries=2))
+    assert route.lane.retried == retried
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from argo.kernel.llm_scheduler import ProviderLane
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+class BadRequest(Exception):
+    status_code = 400
+
+
+def make_lane() -> ProviderLane:
+    lane = ProviderLane("test", max_concurrency=4, rpm=0, tpm=0)
+    lane.backoff = 0.01
+    return lane
+
+
+def test_call_retries_rate_limits_through_admission():
+    lane = make_lane()
+    calls = []
+
+    async def fn():
+        calls.append(lane.active)
+        if len(calls) < 3:
+            raise RateLimited()
+        return "ok"
+
+    assert asyncio.run(lane.call(fn, retries=3)) == "ok"
+    assert len(calls) == 3
+    assert lane.throttled == 2
+    assert lane.retried == 2
+    # Halved twice from 4, then one additive step after the success
+    assert lane.limit == 2.0
+    assert lane.active == 0
+
+
+def test_call_gives_up_after_retries():
+    lane = make_lane()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        raise RateLimited()
+
+    with pytest.raises(RateLimited):
+        asyncio.run(lane.call(fn, retries=2))
+    assert len(calls) == 3
+    assert lane.active == 0
+
+
+def test_call_does_not_retry_client_errors():
+    lane = make_lane()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        raise BadRequest()
+
+    with pytest.raises(BadRequest):
+        asyncio.run(lane.call(fn, retries=3))
+    assert len(calls) == 1
+
+
+def test_stream_retries_only_before_first_item():
+    lane = make_lane()
+    opened = []
+
+    async def open_stream():
+        opened.append(1)
+        if len(opened) == 1:
+            raise RateLimited()
+        yield "a"
+        raise RateLimited()
+
+    async def consume():
+        received = []
+        with pytest.raises(RateLimited):
+            async for item in lane.stream(open_stream, retries=3):
+                received.append(item)
+        return received
+
+    assert asyncio.run(consume()) == ["a"]
+    assert len(opened) == 2
+    assert lane.active == 0
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from argo.cache.redis_manager import RedisManager
+from argo.kernel.session import SessionMessage, SessionStore
+from argo.kernel.session_backend import RedisSessionBackend
+
+fakeredis = pytest.importorskip("fakeredis", reason="needs fakeredis[lua] to run the session scripts")
+
+KEY = ("user", "agent")
+
+
+def make_backend() -> RedisSessionBackend:
+    redis_manager = RedisManager()
+    redis_manager._pool = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    return RedisSessionBackend(redis_manager, ttl=60)
+
+
+def turn(i: int):
+    return [SessionMessage.from_role("user", f"question {i}"), SessionMessage.from_role("assistant", f"answer {i}")]
+
+
+def test_append_bumps_the_version_and_caps_the_list():
+    backend = make_backend()
+
+    async def run():
+        versions = [await backend.append(KEY, turn(i), max_messages=4) for i in range(3)]
+        return versions, await backend.version(KEY), await backend.load(KEY)
+
+    versions, version, (loaded_version, messages, summary) = asyncio.run(run())
+    assert versions == [1, 2, 3]
+    assert version == loaded_version == 3
+    assert [message.content for message in messages] == ["question 1", "answer 1", "question 2", "answer 2"]
+    assert [message.seq for message in messages] == [2, 2, 3, 3]
+    assert summary is None
+
+
+def test_summary_drops_folded_turns():
+    backend = make_backend()
+
+    async def run():
+        for i in range(3):
+            await backend.append(KEY, turn(i), max_messages=10)
+        version = await backend.save_summary(KEY, "talked about 0 and 1", folded_seq=2)
+        return version, await backend.load(KEY)
+
+    version, (loaded_version, messages, summary) = asyncio.run(run())
+    assert version == loaded_version == 4
+    assert [message.content for message in messages] == ["question 2", "answer 2"]
+    assert summary == "talked about 0 and 1"
+
+
+def test_store_reloads_sessions_written_by_another_worker():
+    backend = make_backend()
+    store, other = SessionStore(backend=backend), SessionStore(backend=backend)
+
+    async def run():
+        session = await store.get_session(*KEY, max_messages=10)
+        await store.append(session, *turn(0))
+        assert session.version == 1
+
+        other_session = await other.get_session(*KEY, max_messages=10)
+        assert len(other_session) == 2
+        await other.append(other_session, *turn(1))
+
+        session = await store.get_session(*KEY, max_messages=10)
+        return [message.content for message in session.history()]
+
+    assert asyncio.run(run()) == ["question 0", "answer 0", "question 1", "answer 1"]
+
+
+def test_remove_reports_whether_a_session_existed():
+    backend = make_backend()
+    store = SessionStore(backend=backend)
+
+    async def run():
+        session = await store.get_session(*KEY, max_messages=10)
+        await store.append(session, *turn(0))
+        # A fresh store with nothing cached locally still clears the shared session
+        return await SessionStore(backend=backend).remove(*KEY), await store.remove(*KEY)
+
+    assert asyncio.run(run()) == (True, False)
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from argo.kernel.llm_scheduler import ProviderLane
+from argo.kernel.single_flight import SingleFlight
+
+
+def lane_stream(lane: ProviderLane, chunks: int = 50, delay: float = 0.01):
+    async def open_stream():
+        for i in range(chunks):
+            await asyncio.sleep(delay)
+            yield f"{i} "
+
+    return lane.stream(open_stream)
+
+
+def test_stream_is_cancelled_when_the_only_subscriber_leaves():
+    flight = SingleFlight()
+    lane = ProviderLane("test", max_concurrency=4, rpm=0, tpm=0)
+
+    async def run():
+        stream = flight.stream("key", lambda: lane_stream(lane))
+        async for _ in stream:
+            break
+        assert lane.active == 1
+        await stream.aclose()
+        # Let the cancelled pump run its cleanup, well before the upstream
+        # stream would have finished on its own
+        await asyncio.sleep(0.02)
+        assert lane.active == 0
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(run())
+
+
+def test_stream_continues_while_a_subscriber_remains():
+    flight = SingleFlight()
+    lane = ProviderLane("test", max_concurrency=4, rpm=0, tpm=0)
+
+    async def run():
+        first = flight.stream("key", lambda: lane_stream(lane, chunks=5))
+        second = flight.stream("key", lambda: lane_stream(lane, chunks=5))
+        async for _ in first:
+            break
+        await first.aclose()
+        return [chunk async for chunk in second]
+
+    assert asyncio.run(run()) == [f"{i} " for i in range(5)]
+    assert flight.coalesced == 1
+    assert lane.active == 0
+
+
+def test_late_subscriber_replays_from_the_start():
+    flight = SingleFlight()
+    lane = ProviderLane("test", max_concurrency=4, rpm=0, tpm=0)
+
+    async def run():
+        first = flight.stream("key", lambda: lane_stream(lane, chunks=4))
+        received = [await first.__anext__(), await first.__anext__()]
+        late = flight.stream("key", lambda: lane_stream(lane, chunks=4))
+        received += [chunk async for chunk in first]
+        return received, [chunk async for chunk in late]
+
+    first, late = asyncio.run(run())
+    assert first == late == [f"{i} " for i in range(4)]
+
+
+def test_stream_errors_reach_every_subscriber():
+    flight = SingleFlight()
+
+    async def failing():
+        yield "a"
+        raise RuntimeError("provider down")
+
+    async def consume(stream):
+        return [chunk async for chunk in stream]
+
+    async def run():
+        streams = [flight.stream("key", failing) for _ in range(2)]
+        return await asyncio.gather(*(consume(stream) for stream in streams), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_do_coalesces_and_survives_a_cancelled_caller():
+    flight = SingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def run():
+        first = asyncio.create_task(flight.do("key", fn))
+        second = asyncio.create_task(flight.do("key", fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "result"
+    assert len(calls) == 1
+    assert flight.coalesced == 1
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from argo.utils.startup_profile import (
+    IMPORT_BUDGET_SECONDS,
+    eager_deferred_imports,
+    import_seconds,
+    profile_imports,
+)
+
+
+def test_main_import_defers_heavy_modules():
+    entries = profile_imports("argo.main")
+    assert eager_deferred_imports(entries) == []
+
+
+# Wall-clock timing depends on the machine, so it only runs where asked for
+@pytest.mark.skipif(not os.environ.get("ARGO_IMPORT_BUDGET_TEST"), reason="set ARGO_IMPORT_BUDGET_TEST=1 to run")
+def test_main_import_within_budget():
+    # Best of three, a single cold import is noisy on shared machines
+    seconds = min(import_seconds(profile_imports("argo.main")) for _ in range(3))
+    assert seconds <= IMPORT_BUDGET_SECONDS, f"import argo.main took {seconds:.3f}s"
@@ -0,0 +1,134 @@
+import asyncio
+import contextvars
+import json
+
+import pytest
+
+from argo.kernel.llm_scheduler import ProviderLane
+from argo.kernel.single_flight import SingleFlight
+from argo.websocket.stream_encoder import StreamFrameEncoder, coalesce_chunks
+from argo.websocket.websocket_handler import stream_chat
+from argo.websocket.websocket_manager import WebSocketManager
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+async def paced(chunks, delay: float = 0.0):
+    for chunk in chunks:
+        await asyncio.sleep(delay)
+        yield chunk
+
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+
+def test_frame_matches_full_serialization():
+    encoder = StreamFrameEncoder("agent")
+    frame = json.loads(encoder.frame('say "hi"\n'))
+    assert frame["content"] == 'say "hi"\n'
+    assert frame["agent_id"] == "agent"
+    assert frame["is_final"] is False
+    assert json.loads(encoder.final_frame)["is_final"] is True
+
+
+def test_coalesce_flushes_on_size():
+    chunks = ["ab", "cd", "ef", "g"]
+    assert asyncio.run(collect(coalesce_chunks(paced(chunks), 4, 10.0))) == ["abcd", "efg"]
+
+
+def test_coalesce_flushes_on_deadline():
+    async def source():
+        yield "a"
+        yield "b"
+        await asyncio.sleep(0.05)
+        yield "c"
+
+    assert asyncio.run(collect(coalesce_chunks(source(), 1024, 0.01))) == ["ab", "c"]
+
+
+def test_coalesce_passthrough():
+    assert asyncio.run(collect(coalesce_chunks(paced(["a", "b"]), 0, 0))) == ["a", "b"]
+
+
+def test_source_context_persists_across_chunks():
+    async def source():
+        token = request_id.set("req-1")
+        try:
+            for i in range(3):
+                await asyncio.sleep(0.01)
+                yield str(request_id.get())
+        finally:
+            request_id.reset(token)
+
+    assert asyncio.run(collect(coalesce_chunks(source(), 1024, 0.001))) == ["req-1"] * 3
+
+
+def test_error_flushes_buffer_then_raises():
+    async def source():
+        yield "partial"
+        raise RuntimeError("provider down")
+
+    async def run():
+        received = []
+        with pytest.raises(RuntimeError):
+            async for chunk in coalesce_chunks(source(), 1024, 10.0):
+                received.append(chunk)
+        return received
+
+    assert asyncio.run(run()) == ["partial"]
+
+
+def test_closing_early_closes_the_source():
+    closed = []
+
+    async def source():
+        try:
+            while True:
+                await asyncio.sleep(0.001)
+                yield "x"
+        finally:
+            closed.append(1)
+
+    async def run():
+        stream = coalesce_chunks(source(), 1, 0.01)
+        async for _ in stream:
+            break
+        await stream.aclose()
+
+    asyncio.run(run())
+    assert closed == [1]
+
+
+class FlakySocket:
+    def __init__(self, fail_after: int):
+        self.fail_after = fail_after
+        self.sent = []
+
+    async def send_text(self, message: str):
+        if len(self.sent) >= self.fail_after:
+            raise RuntimeError("Cannot call send once a close message has been sent")
+        self.sent.append(message)
+
+
+def test_disconnect_releases_the_lane_slot():
+    flight = SingleFlight()
+    lane = ProviderLane("test", max_concurrency=4, rpm=0, tpm=0)
+    manager = WebSocketManager()
+    manager.active_connections["user"] = FlakySocket(fail_after=2)
+
+    async def open_stream():
+        for i in range(100):
+            await asyncio.sleep(0.005)
+            yield f"{i} "
+
+    async def run():
+        chunks = flight.stream("key", lambda: lane.stream(open_stream))
+        assert not await stream_chat(manager, "user", "agent", chunks)
+        # Well before the upstream stream would have finished on its own
+        await asyncio.sleep(0.02)
+        assert lane.active == 0
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(run())
+    assert "user" not in manager.active_connections
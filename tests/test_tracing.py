@@ -0,0 +1,53 @@
+import asyncio
+
+from argo.metrics.tracing import Tracer
+
+
+def test_nested_spans_share_a_trace():
+    tracer = Tracer(sample_rate=1.0, buffer_size=10)
+    with tracer.span("outer") as outer:
+        with tracer.span("inner") as inner:
+            pass
+    assert inner.parent_id == outer.span_id
+    assert [span.name for span in tracer.traces[-1].spans] == ["inner", "outer"]
+
+
+def test_started_span_does_not_become_current():
+    tracer = Tracer(sample_rate=1.0, buffer_size=10)
+    with tracer.span("request") as request:
+        stream = tracer.start("stream")
+        with tracer.span("sibling") as sibling:
+            pass
+        stream.finish(RuntimeError())
+    assert stream.parent_id == sibling.parent_id == request.span_id
+    assert stream.attrs["error"] == "RuntimeError"
+
+
+def test_generator_span_survives_being_closed_from_another_task():
+    tracer = Tracer(sample_rate=1.0, buffer_size=10)
+
+    async def generate():
+        span = tracer.start("generate")
+        try:
+            while True:
+                yield 1
+        finally:
+            span.finish()
+
+    async def run():
+        stream = generate()
+        await stream.__anext__()
+        await asyncio.create_task(stream.aclose())
+
+    asyncio.run(run())
+    assert tracer.traces[-1].root.name == "generate"
+
+
+def test_unsampled_requests_skip_nested_spans():
+    tracer = Tracer(sample_rate=0.0, buffer_size=10)
+    with tracer.span("request"):
+        with tracer.span("inner"):
+            pass
+        tracer.start("stream").finish()
+    assert not tracer.traces
+